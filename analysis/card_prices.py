@@ -4,33 +4,48 @@ import time
 from datetime import date
 
 from db.models import (
-    get_connection, get_players_by_draft_year, add_card_value,
+    get_connection, get_players_by_draft_year, add_card_values_bulk,
     get_latest_card_values, get_card_price_history,
 )
 from scrapers.ebay import EbayClient
 from analysis.movers import get_consensus_board
 
 DRAFT_YEARS = [2026, 2027, 2028, 2029, 2030]
-
-
-def track_player_cards(player_id, player_name, ebay_client=None):
-    """Search eBay for a player's autograph cards and store prices."""
+# Card values are written every this many players so a long run keeps its progress
+TRACK_BATCH_SIZE = 100
+
+
+def _card_value_from_summary(player_id, summary):
+    """Build the card_values record for an eBay card summary."""
+    return {
+        "player_id": player_id,
+        "value_dollars": summary["lowest_bin"],
+        "card_type": "autograph",
+        "source": "ebay",
+        "listing_count": summary["listing_count"],
+        "lowest_bin": summary["lowest_bin"],
+        "avg_price": summary["avg_price"],
+        "ebay_search_url": summary["ebay_search_url"],
+        "notes": f"{summary['listing_count']} listings found" if summary["listing_count"] else "No listings found",
+    }
+
+
+def track_player_cards(player_id, player_name, ebay_client=None, pending_values=None):
+    """Search eBay for a player's autograph cards and store prices.
+
+    If pending_values is given, the card value is appended to it for the
+    caller to store in bulk instead of being written right away.
+    """
     if ebay_client is None:
         ebay_client = EbayClient()
 
     summary = ebay_client.get_player_card_summary(player_name)
 
-    add_card_value(
-        player_id=player_id,
-        value_dollars=summary["lowest_bin"],
-        card_type="autograph",
-        source="ebay",
-        listing_count=summary["listing_count"],
-        lowest_bin=summary["lowest_bin"],
-        avg_price=summary["avg_price"],
-        ebay_search_url=summary["ebay_search_url"],
-        notes=f"{summary['listing_count']} listings found" if summary["listing_count"] else "No listings found",
-    )
+    value = _card_value_from_summary(player_id, summary)
+    if pending_values is None:
+        add_card_values_bulk([value])
+    else:
+        pending_values.append(value)
 
     return summary
 
@@ -54,24 +69,33 @@ def track_all_players(draft_year=None, delay=1.0):
             continue
 
         print(f"\n--- {year} Draft Class ({len(players)} players) ---")
-
-        for p in players:
-            total += 1
-            print(f"  Searching: {p['name']}...", end=" ", flush=True)
-
-            try:
-                summary = track_player_cards(p["id"], p["name"], ebay)
-                if summary["listing_count"] > 0:
-                    found += 1
-                    print(f"${summary['lowest_bin']:.2f} lowest "
-                          f"(${summary['avg_price']:.2f} avg, "
-                          f"{summary['listing_count']} listings)")
-                else:
-                    print("no listings")
-            except Exception as e:
-                print(f"ERROR: {e}")
-
-            time.sleep(delay)
+        values = []
+
+        try:
+            for p in players:
+                total += 1
+                print(f"  Searching: {p['name']}...", end=" ", flush=True)
+
+                try:
+                    summary = track_player_cards(p["id"], p["name"], ebay, pending_values=values)
+                    if summary["listing_count"] > 0:
+                        found += 1
+                        print(f"${summary['lowest_bin']:.2f} lowest "
+                              f"(${summary['avg_price']:.2f} avg, "
+                              f"{summary['listing_count']} listings)")
+                    else:
+                        print("no listings")
+                except Exception as e:
+                    print(f"ERROR: {e}")
+
+                if len(values) >= TRACK_BATCH_SIZE:
+                    add_card_values_bulk(values)
+                    values.clear()
+
+                time.sleep(delay)
+        finally:
+            # Also runs on Ctrl-C, so prices already fetched are not lost
+            add_card_values_bulk(values)
 
     print(f"\nDone: {found}/{total} players have cards on eBay")
     return {"total": total, "found": found}
@@ -113,7 +137,6 @@ def get_best_buys(draft_year=None):
 
     query += " ORDER BY cv.lowest_bin ASC"
     rows = conn.execute(query, params).fetchall()
-    conn.close()
 
     results = []
     for r in rows:
@@ -157,7 +180,6 @@ def get_price_changes(days_back=7):
           AND l.lowest_bin != prev.lowest_bin
         ORDER BY (prev.lowest_bin - l.lowest_bin) / prev.lowest_bin DESC
     """).fetchall()
-    conn.close()
 
     results = []
     for r in rows:
@@ -73,7 +73,6 @@ def get_movers(draft_year=None, days_back=30, sport=None):
     """
 
     rows = conn.execute(query, params).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -123,7 +122,6 @@ def get_consensus_board(draft_year, sport=None):
             ORDER BY COALESCE(avg_rank, 999), p.name
         """, (draft_year,)).fetchall()
 
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -138,7 +136,6 @@ def get_new_entries(days_back=7):
         WHERE p.created_at >= datetime('now', ?)
         ORDER BY p.draft_year, r.rank
     """, (f"-{days_back} days",)).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -48,8 +48,6 @@ def recalculate_all_tiers(draft_year=None):
         rows = conn.execute("SELECT DISTINCT draft_year FROM players ORDER BY draft_year").fetchall()
         years = [r['draft_year'] for r in rows]
 
-    conn.close()
-
     tier_counts = {'A': 0, 'B': 0, 'C': 0, 'D': 0, 'unranked': 0}
     updated_players = []
 
@@ -90,7 +88,6 @@ def get_tier_summary(draft_year):
         GROUP BY tier
         ORDER BY tier
     """, (draft_year,)).fetchall()
-    conn.close()
     return {r['tier']: r['count'] for r in rows}
 
 
@@ -104,5 +101,4 @@ def get_players_by_tier(draft_year, tier):
         WHERE p.draft_year = ? AND p.tier = ?
         ORDER BY avg_rank, p.name
     """, (draft_year, tier.upper())).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
@@ -4,13 +4,14 @@ User management, admin management, scraper scheduling
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 import subprocess
 import os
 
-from auth import get_current_user
+from auth import get_current_user, hash_password
 from database import get_db
 
 router = APIRouter()
@@ -54,38 +55,41 @@ async def list_users(
     """List all users (admin only)"""
     offset = (page - 1) * per_page
 
-    with get_db() as conn:
-        cursor = conn.cursor()
-
-        # Get total count
-        cursor.execute("SELECT COUNT(*) FROM users")
-        total = cursor.fetchone()[0]
+    def fetch_users():
+        with get_db(readonly=True) as conn:
+            cursor = conn.cursor()
+
+            # Get total count
+            cursor.execute("SELECT COUNT(*) FROM users")
+            total = cursor.fetchone()[0]
+
+            # Get users with pagination
+            cursor.execute("""
+                SELECT id, email, username, created_at, is_active
+                FROM users
+                ORDER BY created_at DESC
+                LIMIT ? OFFSET ?
+            """, (per_page, offset))
+
+            users = []
+            for row in cursor.fetchall():
+                users.append({
+                    "id": row[0],
+                    "email": row[1],
+                    "username": row[2],
+                    "createdAt": row[3],
+                    "isActive": bool(row[4]),
+                    "isAdmin": row[1] in ADMIN_EMAILS
+                })
+
+            return {
+                "users": users,
+                "total": total,
+                "page": page,
+                "perPage": per_page
+            }
 
-        # Get users with pagination
-        cursor.execute("""
-            SELECT id, email, username, created_at, is_active
-            FROM users
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """, (per_page, offset))
-
-        users = []
-        for row in cursor.fetchall():
-            users.append({
-                "id": row[0],
-                "email": row[1],
-                "username": row[2],
-                "createdAt": row[3],
-                "isActive": bool(row[4]),
-                "isAdmin": row[1] in ADMIN_EMAILS
-            })
-
-        return {
-            "users": users,
-            "total": total,
-            "page": page,
-            "perPage": per_page
-        }
+    return await run_in_threadpool(fetch_users)
 
 @router.get("/users/{user_id}")
 async def get_user(
@@ -93,32 +97,35 @@ async def get_user(
     admin: dict = Depends(require_admin)
 ):
     """Get user details (admin only)"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, email, username, created_at, updated_at, is_active
-            FROM users
-            WHERE id = ?
-        """, (user_id,))
-
-        row = cursor.fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # Get user's card count
-        cursor.execute("SELECT COUNT(*) FROM user_cards WHERE user_id = ?", (user_id,))
-        card_count = cursor.fetchone()[0]
+    def fetch_user():
+        with get_db(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, email, username, created_at, updated_at, is_active
+                FROM users
+                WHERE id = ?
+            """, (user_id,))
+
+            row = cursor.fetchone()
+            if not row:
+                raise HTTPException(status_code=404, detail="User not found")
+
+            # Get user's card count
+            cursor.execute("SELECT COUNT(*) FROM user_cards WHERE user_id = ?", (user_id,))
+            card_count = cursor.fetchone()[0]
+
+            return {
+                "id": row[0],
+                "email": row[1],
+                "username": row[2],
+                "createdAt": row[3],
+                "updatedAt": row[4],
+                "isActive": bool(row[5]),
+                "isAdmin": row[1] in ADMIN_EMAILS,
+                "cardCount": card_count
+            }
 
-        return {
-            "id": row[0],
-            "email": row[1],
-            "username": row[2],
-            "createdAt": row[3],
-            "updatedAt": row[4],
-            "isActive": bool(row[5]),
-            "isAdmin": row[1] in ADMIN_EMAILS,
-            "cardCount": card_count
-        }
+    return await run_in_threadpool(fetch_user)
 
 @router.put("/users/{user_id}")
 async def update_user(
@@ -127,44 +134,47 @@ async def update_user(
     admin: dict = Depends(require_admin)
 ):
     """Update user (admin only)"""
-    with get_db() as conn:
-        cursor = conn.cursor()
+    def write_updates():
+        with get_db() as conn:
+            cursor = conn.cursor()
 
-        # Build update query
-        set_clauses = []
-        params = []
+            # Build update query
+            set_clauses = []
+            params = []
 
-        if updates.email is not None:
-            set_clauses.append("email = ?")
-            params.append(updates.email.lower())
+            if updates.email is not None:
+                set_clauses.append("email = ?")
+                params.append(updates.email.lower())
 
-        if updates.username is not None:
-            set_clauses.append("username = ?")
-            params.append(updates.username)
+            if updates.username is not None:
+                set_clauses.append("username = ?")
+                params.append(updates.username)
 
-        if updates.is_active is not None:
-            set_clauses.append("is_active = ?")
-            params.append(1 if updates.is_active else 0)
+            if updates.is_active is not None:
+                set_clauses.append("is_active = ?")
+                params.append(1 if updates.is_active else 0)
 
-        if not set_clauses:
-            raise HTTPException(status_code=400, detail="No updates provided")
+            if not set_clauses:
+                raise HTTPException(status_code=400, detail="No updates provided")
 
-        set_clauses.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
-        params.append(user_id)
+            set_clauses.append("updated_at = ?")
+            params.append(datetime.utcnow().isoformat())
+            params.append(user_id)
 
-        cursor.execute(f"""
-            UPDATE users
-            SET {', '.join(set_clauses)}
-            WHERE id = ?
-        """, params)
+            cursor.execute(f"""
+                UPDATE users
+                SET {', '.join(set_clauses)}
+                WHERE id = ?
+            """, params)
 
-        conn.commit()
+            conn.commit()
 
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="User not found")
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="User not found")
 
-        return {"message": "User updated successfully"}
+            return {"message": "User updated successfully"}
+
+    return await run_in_threadpool(write_updates)
 
 @router.post("/users/{user_id}/reset-password")
 async def admin_reset_password(
@@ -173,29 +183,27 @@ async def admin_reset_password(
     admin: dict = Depends(require_admin)
 ):
     """Reset user password (admin only)"""
-    import bcrypt
+    # Hash new password off the event loop
+    password_hash = await run_in_threadpool(hash_password, reset.new_password)
 
-    with get_db() as conn:
-        cursor = conn.cursor()
+    def write_password():
+        with get_db() as conn:
+            cursor = conn.cursor()
 
-        # Hash new password
-        password_hash = bcrypt.hashpw(
-            reset.new_password.encode('utf-8'),
-            bcrypt.gensalt()
-        ).decode('utf-8')
+            cursor.execute("""
+                UPDATE users
+                SET password_hash = ?, updated_at = ?
+                WHERE id = ?
+            """, (password_hash, datetime.utcnow().isoformat(), user_id))
 
-        cursor.execute("""
-            UPDATE users
-            SET password_hash = ?, updated_at = ?
-            WHERE id = ?
-        """, (password_hash, datetime.utcnow().isoformat(), user_id))
+            conn.commit()
 
-        conn.commit()
+            if cursor.rowcount == 0:
+                raise HTTPException(status_code=404, detail="User not found")
 
-        if cursor.rowcount == 0:
-            raise HTTPException(status_code=404, detail="User not found")
+            return {"message": "Password reset successfully"}
 
-        return {"message": "Password reset successfully"}
+    return await run_in_threadpool(write_password)
 
 @router.delete("/users/{user_id}")
 async def delete_user(
@@ -203,27 +211,30 @@ async def delete_user(
     admin: dict = Depends(require_admin)
 ):
     """Delete user (admin only)"""
-    with get_db() as conn:
-        cursor = conn.cursor()
+    def delete_rows():
+        with get_db() as conn:
+            cursor = conn.cursor()
+
+            # Check if user exists
+            cursor.execute("SELECT email FROM users WHERE id = ?", (user_id,))
+            user = cursor.fetchone()
 
-        # Check if user exists
-        cursor.execute("SELECT email FROM users WHERE id = ?", (user_id,))
-        user = cursor.fetchone()
+            if not user:
+                raise HTTPException(status_code=404, detail="User not found")
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
+            # Prevent deleting admin users
+            if user[0] in ADMIN_EMAILS:
+                raise HTTPException(status_code=403, detail="Cannot delete admin users")
 
-        # Prevent deleting admin users
-        if user[0] in ADMIN_EMAILS:
-            raise HTTPException(status_code=403, detail="Cannot delete admin users")
+            # Delete user's cards first (CASCADE)
+            cursor.execute("DELETE FROM user_cards WHERE user_id = ?", (user_id,))
+            cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
 
-        # Delete user's cards first (CASCADE)
-        cursor.execute("DELETE FROM user_cards WHERE user_id = ?", (user_id,))
-        cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
+            conn.commit()
 
-        conn.commit()
+            return {"message": "User deleted successfully"}
 
-        return {"message": "User deleted successfully"}
+    return await run_in_threadpool(delete_rows)
 
 # ============================================================================
 # Admin Management
@@ -232,25 +243,28 @@ async def delete_user(
 @router.get("/admins")
 async def list_admins(admin: dict = Depends(require_admin)):
     """List all admin users"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, email, username, created_at
-            FROM users
-            WHERE email IN ({})
-            ORDER BY created_at
-        """.format(','.join('?' * len(ADMIN_EMAILS))), ADMIN_EMAILS)
-
-        admins = []
-        for row in cursor.fetchall():
-            admins.append({
-                "id": row[0],
-                "email": row[1],
-                "username": row[2],
-                "createdAt": row[3]
-            })
-
-        return {"admins": admins}
+    def fetch_admins():
+        with get_db(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, email, username, created_at
+                FROM users
+                WHERE email IN ({})
+                ORDER BY created_at
+            """.format(','.join('?' * len(ADMIN_EMAILS))), ADMIN_EMAILS)
+
+            admins = []
+            for row in cursor.fetchall():
+                admins.append({
+                    "id": row[0],
+                    "email": row[1],
+                    "username": row[2],
+                    "createdAt": row[3]
+                })
+
+            return {"admins": admins}
+
+    return await run_in_threadpool(fetch_admins)
 
 # ============================================================================
 # Scraper Management
@@ -354,45 +368,48 @@ async def list_scrapers(admin: dict = Depends(require_admin)):
 @router.get("/stats")
 async def get_system_stats(admin: dict = Depends(require_admin)):
     """Get system statistics (admin only)"""
-    with get_db() as conn:
-        cursor = conn.cursor()
-
-        # User stats
-        cursor.execute("SELECT COUNT(*) FROM users")
-        total_users = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM users WHERE is_active = 1")
-        active_users = cursor.fetchone()[0]
-
-        # Card stats
-        cursor.execute("SELECT COUNT(*) FROM user_cards")
-        total_cards = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(DISTINCT user_id) FROM user_cards")
-        users_with_cards = cursor.fetchone()[0]
-
-        # Recent activity
-        cursor.execute("""
-            SELECT COUNT(*) FROM user_cards
-            WHERE created_at > datetime('now', '-7 days')
-        """)
-        cards_last_week = cursor.fetchone()[0]
-
-        cursor.execute("""
-            SELECT COUNT(*) FROM users
-            WHERE created_at > datetime('now', '-7 days')
-        """)
-        new_users_last_week = cursor.fetchone()[0]
-
-        return {
-            "users": {
-                "total": total_users,
-                "active": active_users,
-                "newLastWeek": new_users_last_week
-            },
-            "cards": {
-                "total": total_cards,
-                "usersWithCards": users_with_cards,
-                "addedLastWeek": cards_last_week
+    def fetch_stats():
+        with get_db(readonly=True) as conn:
+            cursor = conn.cursor()
+
+            # User stats
+            cursor.execute("SELECT COUNT(*) FROM users")
+            total_users = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(*) FROM users WHERE is_active = 1")
+            active_users = cursor.fetchone()[0]
+
+            # Card stats
+            cursor.execute("SELECT COUNT(*) FROM user_cards")
+            total_cards = cursor.fetchone()[0]
+
+            cursor.execute("SELECT COUNT(DISTINCT user_id) FROM user_cards")
+            users_with_cards = cursor.fetchone()[0]
+
+            # Recent activity
+            cursor.execute("""
+                SELECT COUNT(*) FROM user_cards
+                WHERE created_at > datetime('now', '-7 days')
+            """)
+            cards_last_week = cursor.fetchone()[0]
+
+            cursor.execute("""
+                SELECT COUNT(*) FROM users
+                WHERE created_at > datetime('now', '-7 days')
+            """)
+            new_users_last_week = cursor.fetchone()[0]
+
+            return {
+                "users": {
+                    "total": total_users,
+                    "active": active_users,
+                    "newLastWeek": new_users_last_week
+                },
+                "cards": {
+                    "total": total_cards,
+                    "usersWithCards": users_with_cards,
+                    "addedLastWeek": cards_last_week
+                }
             }
-        }
+
+    return await run_in_threadpool(fetch_stats)
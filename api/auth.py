@@ -4,6 +4,7 @@ JWT-based authentication with bcrypt password hashing
 """
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
@@ -64,7 +65,7 @@ class AuthResponse(BaseModel):
 # ============================================================================
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using bcrypt. CPU-bound; call via run_in_threadpool from routes."""
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 def verify_password(password: str, hashed: str) -> bool:
@@ -99,7 +100,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = get_user_by_id(user_id)
+    user = await run_in_threadpool(get_user_by_id, user_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
 
@@ -125,22 +126,22 @@ def format_user(user: dict) -> dict:
 async def register(data: UserRegister):
     """Register a new user."""
     # Check if email exists
-    if get_user_by_email(data.email):
+    if await run_in_threadpool(get_user_by_email, data.email):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Email already registered"
         )
 
     # Check if username exists
-    if get_user_by_username(data.username):
+    if await run_in_threadpool(get_user_by_username, data.username):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Username already taken"
         )
 
     # Create user
-    password_hash = hash_password(data.password)
-    user = create_user(data.email, data.username, password_hash)
+    password_hash = await run_in_threadpool(hash_password, data.password)
+    user = await run_in_threadpool(create_user, data.email, data.username, password_hash)
 
     # Generate token
     token = create_token(user["id"])
@@ -153,7 +154,7 @@ async def register(data: UserRegister):
 @router.post("/login", response_model=AuthResponse)
 async def login(data: UserLogin):
     """Login a user."""
-    user = get_user_by_email(data.email)
+    user = await run_in_threadpool(get_user_by_email, data.email)
 
     if not user:
         raise HTTPException(
@@ -161,7 +162,7 @@ async def login(data: UserLogin):
             detail="Invalid email or password"
         )
 
-    if not verify_password(data.password, user["password_hash"]):
+    if not await run_in_threadpool(verify_password, data.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -188,7 +189,7 @@ async def validate_token(current_user: dict = Depends(get_current_user)):
 @router.post("/reset-password")
 async def request_password_reset(data: PasswordReset):
     """Request a password reset email."""
-    user = get_user_by_email(data.email)
+    user = await run_in_threadpool(get_user_by_email, data.email)
 
     # Always return success to prevent email enumeration
     if not user:
@@ -198,7 +199,7 @@ async def request_password_reset(data: PasswordReset):
     reset_token = secrets.token_urlsafe(32)
     expires = (datetime.utcnow() + timedelta(hours=1)).isoformat()
 
-    set_reset_token(user["id"], reset_token, expires)
+    await run_in_threadpool(set_reset_token, user["id"], reset_token, expires)
 
     # TODO: Send email with reset link
     # For now, just log it (in production, use a proper email service)
@@ -210,22 +211,22 @@ async def request_password_reset(data: PasswordReset):
 async def change_password(data: PasswordChange, current_user: dict = Depends(get_current_user)):
     """Change the current user's password."""
     # Verify current password
-    if not verify_password(data.current_password, current_user["password_hash"]):
+    if not await run_in_threadpool(verify_password, data.current_password, current_user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Current password is incorrect"
         )
 
     # Update password
-    new_hash = hash_password(data.new_password)
-    update_user_password(current_user["id"], new_hash)
+    new_hash = await run_in_threadpool(hash_password, data.new_password)
+    await run_in_threadpool(update_user_password, current_user["id"], new_hash)
 
     return {"message": "Password changed successfully"}
 
 @router.post("/reset-password/{token}")
 async def reset_password_with_token(token: str, data: PasswordResetConfirm):
     """Reset password using a reset token."""
-    user = get_user_by_reset_token(token)
+    user = await run_in_threadpool(get_user_by_reset_token, token)
 
     if not user:
         raise HTTPException(
@@ -242,7 +243,7 @@ async def reset_password_with_token(token: str, data: PasswordResetConfirm):
         )
 
     # Update password
-    new_hash = hash_password(data.new_password)
-    update_user_password(user["id"], new_hash)
+    new_hash = await run_in_threadpool(hash_password, data.new_password)
+    await run_in_threadpool(update_user_password, user["id"], new_hash)
 
     return {"message": "Password reset successfully"}
@@ -4,20 +4,27 @@ CRUD operations and card identification
 """
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+import asyncio
 import httpx
+import logging
 import os
 import base64
 
 from auth import get_current_user
 from database import (
-    create_card, get_card_by_id, get_user_cards,
+    create_card, get_user_card, get_user_cards, get_user_cards_by_ids,
     update_card, delete_card, format_card,
-    add_market_price, get_latest_market_price, get_market_price_history
+    add_market_prices, get_latest_market_price, get_market_price_history
 )
 from market_value import get_market_fetcher
+from card_identifier import get_identifier
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -76,6 +83,11 @@ class CardUpdate(BaseModel):
     class Config:
         populate_by_name = True
 
+class MarketValueInfo(BaseModel):
+    currentValue: Optional[float] = None
+    confidence: Optional[float] = None
+    lastChecked: Optional[str] = None
+
 class CardResponse(BaseModel):
     id: str
     playerName: str
@@ -91,6 +103,7 @@ class CardResponse(BaseModel):
     backImageUrl: Optional[str] = None
     purchasePrice: Optional[float] = None
     estimatedValue: Optional[float] = None
+    marketValue: Optional[MarketValueInfo] = None
     notes: Optional[str] = None
     createdAt: str
     updatedAt: str
@@ -100,6 +113,7 @@ class CardListResponse(BaseModel):
     total: int
     page: int
     perPage: int
+    nextCursor: Optional[str] = None
 
 class CardIdentificationResponse(BaseModel):
     playerName: Optional[str] = None
@@ -113,25 +127,45 @@ class CardIdentificationResponse(BaseModel):
     confidence: float
     grading: Optional[GradingInfo] = None
 
+class MarketValueBatchRequest(BaseModel):
+    cardIds: List[str] = Field(..., alias="card_ids", min_length=1, max_length=100)
+
+    class Config:
+        populate_by_name = True
+
 # ============================================================================
 # Routes
 # ============================================================================
 
-@router.get("", response_model=CardListResponse)
+@router.get("", response_model=None, responses={200: {"model": CardListResponse}})
 async def list_cards(
-    page: int = Query(1, ge=1),
+    page: int = Query(1, ge=1, deprecated=True),
     per_page: int = Query(50, ge=1, le=100),
     sport: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all cards for the current user."""
-    result = get_user_cards(current_user["id"], page, per_page, sport)
-    return {
+    """
+    Get all cards for the current user.
+
+    Pass the previous response's nextCursor as cursor to fetch the next page;
+    page-number pagination still works but slows down on deep pages.
+
+    Cards come straight from format_card on trusted DB rows, so the page is
+    serialized directly instead of being re-validated against CardResponse.
+    """
+    try:
+        result = await run_in_threadpool(get_user_cards, current_user["id"], page, per_page, sport, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return ORJSONResponse(content={
         "cards": result["cards"],
         "total": result["total"],
         "page": result["page"],
-        "perPage": result["per_page"]
-    }
+        "perPage": result["per_page"],
+        "nextCursor": result["next_cursor"]
+    })
 
 @router.post("", response_model=CardResponse)
 async def add_card(
@@ -159,8 +193,9 @@ async def add_card(
         "notes": card_data.notes
     }
 
-    card = create_card(current_user["id"], data)
-    return format_card(card)
+    card = await run_in_threadpool(create_card, current_user["id"], data)
+    # A new card has no market price history yet
+    return format_card(card, latest_price=None)
 
 @router.get("/{card_id}", response_model=CardResponse)
 async def get_card(
@@ -168,15 +203,12 @@ async def get_card(
     current_user: dict = Depends(get_current_user)
 ):
     """Get a specific card."""
-    card = get_card_by_id(card_id)
+    card = await run_in_threadpool(get_user_card, card_id, current_user["id"])
 
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    if card["user_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    return format_card(card)
+    return await run_in_threadpool(format_card, card)
 
 @router.put("/{card_id}", response_model=CardResponse)
 async def update_card_route(
@@ -220,12 +252,12 @@ async def update_card_route(
     if card_data.notes is not None:
         data["notes"] = card_data.notes
 
-    card = update_card(card_id, current_user["id"], data)
+    card = await run_in_threadpool(update_card, card_id, current_user["id"], data)
 
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    return format_card(card)
+    return await run_in_threadpool(format_card, card)
 
 @router.delete("/{card_id}")
 async def delete_card_route(
@@ -233,7 +265,7 @@ async def delete_card_route(
     current_user: dict = Depends(get_current_user)
 ):
     """Delete a card."""
-    success = delete_card(card_id, current_user["id"])
+    success = await run_in_threadpool(delete_card, card_id, current_user["id"])
 
     if not success:
         raise HTTPException(status_code=404, detail="Card not found")
@@ -252,32 +284,29 @@ async def identify_card(
     Uses Claude Vision, OpenRouter, and Ximilar in fallback chain.
     Target: 90%+ accuracy with confidence scoring.
     """
-    from card_identifier import get_identifier
-
     # Read front image data
     front_data = await image.read()
     front_base64 = base64.b64encode(front_data).decode()
 
-    print(f"🔍 Identifying {sport} card...")
-    print(f"📊 Front image size: {len(front_data) / 1024:.1f} KB")
+    logger.debug("Identifying %s card, front image %.1f KB", sport, len(front_data) / 1024)
 
     # Read back image if provided
     back_base64 = None
     if back_image:
         back_data = await back_image.read()
         back_base64 = base64.b64encode(back_data).decode()
-        print(f"📊 Back image size: {len(back_data) / 1024:.1f} KB")
+        logger.debug("Back image %.1f KB", len(back_data) / 1024)
 
     # Use multi-model identifier
     try:
         identifier = get_identifier()
         result = await identifier.identify_card(front_base64, sport, back_base64)
 
-        print(f"✅ Identification complete:")
-        print(f"   Model: {result.modelUsed}")
-        print(f"   Confidence: {result.confidence:.0%}")
-        print(f"   Player: {result.playerName or 'Unknown'}")
-        print(f"   Needs Confirmation: {result.needsConfirmation}")
+        logger.info(
+            "Identification complete: model=%s confidence=%.0f%% player=%s needs_confirmation=%s",
+            result.modelUsed, result.confidence * 100,
+            result.playerName or "Unknown", result.needsConfirmation
+        )
 
         # Convert to API response format
         return CardIdentificationResponse(
@@ -294,9 +323,7 @@ async def identify_card(
         )
 
     except Exception as e:
-        print(f"❌ Identification error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Identification error: %s", e)
 
         # Return low confidence result on error
         return CardIdentificationResponse(
@@ -395,6 +422,63 @@ async def identify_with_ximilar(image_base64: str) -> CardIdentificationResponse
 
     return CardIdentificationResponse(confidence=0.1)
 
+async def refresh_market_values(cards: List[dict]) -> List[dict]:
+    """
+    Fetch eBay market values for several cards concurrently and store every
+    price that came back in a single transaction.
+    """
+    fetcher = get_market_fetcher()
+    results = await asyncio.gather(*(fetcher.get_card_market_value(card) for card in cards))
+
+    # Store in price history and update each card's estimated_value
+    prices = {
+        card["id"]: market_data
+        for card, market_data in zip(cards, results)
+        if market_data.get("market_price") is not None
+    }
+    if prices:
+        await run_in_threadpool(add_market_prices, prices)
+        logger.info("Stored market prices for %d card(s)", len(prices))
+
+    checked_at = datetime.utcnow().isoformat()
+    return [
+        {
+            "cardId": card["id"],
+            "marketPrice": market_data.get("market_price"),
+            "sampleSize": market_data.get("sample_size", 0),
+            "confidenceLevel": market_data.get("confidence_level", 0.0),
+            "priceRangeLow": market_data.get("price_range_low"),
+            "priceRangeHigh": market_data.get("price_range_high"),
+            "source": market_data.get("source", "ebay_sold"),
+            "checkedAt": checked_at
+        }
+        for card, market_data in zip(cards, results)
+    ]
+
+@router.post("/market-value/batch")
+async def update_market_values_batch(
+    request: MarketValueBatchRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Fetch current market values for several cards at once.
+
+    All eBay lookups run concurrently and the resulting prices are written
+    in one transaction instead of one commit per card.
+    """
+    card_ids = list(dict.fromkeys(request.cardIds))
+    cards = await run_in_threadpool(get_user_cards_by_ids, current_user["id"], card_ids)
+
+    if len(cards) != len(card_ids):
+        raise HTTPException(status_code=404, detail="Card not found")
+
+    results = await refresh_market_values(cards)
+
+    return {
+        "results": results,
+        "total": len(results)
+    }
+
 @router.post("/{card_id}/market-value")
 async def update_card_market_value(
     card_id: str,
@@ -412,38 +496,12 @@ async def update_card_market_value(
     6. Returns current market value
     """
     # Get the card
-    card = get_card_by_id(card_id)
+    card = await run_in_threadpool(get_user_card, card_id, current_user["id"])
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    if card["user_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    # Fetch market value from eBay
-    fetcher = get_market_fetcher()
-    market_data = await fetcher.get_card_market_value(card)
-
-    # Store in price history (even if null, to track when we checked)
-    if market_data.get("market_price") is not None:
-        add_market_price(card_id, market_data)
-        print(f"✅ Stored market price for card {card_id}: ${market_data['market_price']}")
-
-        # Update the card's estimated_value field
-        update_card(card_id, current_user["id"], {
-            "estimated_value": market_data["market_price"]
-        })
-        print(f"✅ Updated card {card_id} estimated_value to ${market_data['market_price']}")
-
-    return {
-        "cardId": card_id,
-        "marketPrice": market_data.get("market_price"),
-        "sampleSize": market_data.get("sample_size", 0),
-        "confidenceLevel": market_data.get("confidence_level", 0.0),
-        "priceRangeLow": market_data.get("price_range_low"),
-        "priceRangeHigh": market_data.get("price_range_high"),
-        "source": market_data.get("source", "ebay_sold"),
-        "checkedAt": datetime.utcnow().isoformat()
-    }
+    results = await refresh_market_values([card])
+    return results[0]
 
 @router.get("/{card_id}/market-value")
 async def get_card_market_value(
@@ -452,15 +510,12 @@ async def get_card_market_value(
 ):
     """Get the most recent market value for a card"""
     # Verify ownership
-    card = get_card_by_id(card_id)
+    card = await run_in_threadpool(get_user_card, card_id, current_user["id"])
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    if card["user_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-
     # Get latest market price
-    latest_price = get_latest_market_price(card_id)
+    latest_price = await run_in_threadpool(get_latest_market_price, card_id)
 
     if not latest_price:
         return {
@@ -488,15 +543,12 @@ async def get_card_price_history(
 ):
     """Get price history for a card (up to 365 data points)"""
     # Verify ownership
-    card = get_card_by_id(card_id)
+    card = await run_in_threadpool(get_user_card, card_id, current_user["id"])
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    if card["user_id"] != current_user["id"]:
-        raise HTTPException(status_code=403, detail="Access denied")
-
     # Get price history
-    history = get_market_price_history(card_id, limit)
+    history = await run_in_threadpool(get_market_price_history, card_id, limit)
 
     return {
         "cardId": card_id,
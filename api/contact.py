@@ -2,7 +2,7 @@
 Contact and Feedback form handlers for CollectorStream website
 """
 
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, BackgroundTasks, Form
 from pydantic import BaseModel, EmailStr
 from typing import Optional
 import logging
@@ -27,57 +27,55 @@ class FeedbackForm(BaseModel):
     email: Optional[EmailStr] = None
 
 
-@router.post("/contact")
+@router.post("/contact", status_code=202)
 async def submit_contact_form(
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
     email: str = Form(...),
     subject: str = Form(...),
     message: str = Form(...)
 ):
-    """Handle contact form submissions from website"""
-    try:
-        success = email_service.send_contact_email(
-            name=name,
-            email=email,
-            subject=subject,
-            message=message
-        )
-
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send email")
-
-        return {
-            "success": True,
-            "message": "Thank you! Your message has been sent."
-        }
-
-    except Exception as e:
-        logger.error(f"Contact form error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to submit form")
-
-
-@router.post("/feedback")
+    """
+    Handle contact form submissions from website.
+
+    The email is sent in the background after the response goes out;
+    delivery failures are logged by the email service.
+    """
+    background_tasks.add_task(
+        email_service.send_contact_email,
+        name=name,
+        email=email,
+        subject=subject,
+        message=message
+    )
+
+    return {
+        "success": True,
+        "message": "Thank you! Your message has been sent."
+    }
+
+
+@router.post("/feedback", status_code=202)
 async def submit_feedback_form(
+    background_tasks: BackgroundTasks,
     feedback_type: str = Form(...),
     feedback: str = Form(...),
     email: Optional[str] = Form(None)
 ):
-    """Handle feedback form submissions from website"""
-    try:
-        success = email_service.send_feedback_email(
-            feedback_type=feedback_type,
-            feedback=feedback,
-            email=email
-        )
-
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send email")
-
-        return {
-            "success": True,
-            "message": "Thank you! Your feedback has been received."
-        }
-
-    except Exception as e:
-        logger.error(f"Feedback form error: {e}")
-        raise HTTPException(status_code=500, detail="Failed to submit form")
+    """
+    Handle feedback form submissions from website.
+
+    The email is sent in the background after the response goes out;
+    delivery failures are logged by the email service.
+    """
+    background_tasks.add_task(
+        email_service.send_feedback_email,
+        feedback_type=feedback_type,
+        feedback=feedback,
+        email=email
+    )
+
+    return {
+        "success": True,
+        "message": "Thank you! Your feedback has been received."
+    }
@@ -3,24 +3,255 @@ Database models and connection for CollectorStream API
 """
 
 import sqlite3
+import base64
+import binascii
+import functools
+import json
 import os
+import queue
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
+from cachetools import TTLCache
 import uuid
 
 # Database path
 DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "collectorstream.db")
 
+# Maximum number of pooled read-only connections
+READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", 8))
+
+# Size of sqlite3's per-connection prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Page cache per connection, in KiB when negative (20 MB)
+PAGE_CACHE_SIZE = -20000
+
+# Latest market price per card_id; prices change at most every few minutes.
+# Per-process, so another worker's write can be stale here for up to the TTL.
+MARKET_PRICE_CACHE_TTL = 300
+_latest_price_cache: TTLCache = TTLCache(maxsize=10_000, ttl=MARKET_PRICE_CACHE_TTL)
+_latest_price_cache_lock = threading.Lock()
+# Token per card_id for the cache fill in progress. Invalidation drops the
+# card's token, so a lookup that read the database before a write landed
+# doesn't cache the pre-write price. Only cards mid-lookup have an entry.
+_latest_price_fills: Dict[str, object] = {}
+
+# Hot-path queries kept as constants so each one reuses the same
+# prepared statement from the connection's statement cache
+SQL_GET_USER_BY_ID = "SELECT * FROM users WHERE id = ?"
+SQL_GET_USER_BY_EMAIL = "SELECT * FROM users WHERE email = ?"
+SQL_GET_USER_BY_USERNAME = "SELECT * FROM users WHERE username = ?"
+SQL_GET_USER_BY_RESET_TOKEN = "SELECT * FROM users WHERE reset_token = ?"
+SQL_GET_CARD_BY_ID = "SELECT * FROM user_cards WHERE id = ?"
+SQL_GET_USER_CARD = "SELECT * FROM user_cards WHERE id = ? AND user_id = ?"
+SQL_DELETE_CARD = "DELETE FROM user_cards WHERE id = ? AND user_id = ?"
+SQL_GET_MARKET_PRICE_BY_ID = "SELECT * FROM card_market_prices WHERE id = ?"
+SQL_GET_LATEST_MARKET_PRICE = """
+    SELECT * FROM card_market_prices
+    WHERE card_id = ?
+    ORDER BY checked_at DESC
+    LIMIT 1
+"""
+SQL_GET_MARKET_PRICE_HISTORY = """
+    SELECT * FROM card_market_prices
+    WHERE card_id = ?
+    ORDER BY checked_at DESC
+    LIMIT ?
+"""
+# Latest `limit` prices for each card in a JSON array of card ids; one
+# parameter keeps the statement text constant whatever the number of cards
+SQL_GET_MARKET_PRICE_HISTORIES = """
+    SELECT * FROM (
+        SELECT *, ROW_NUMBER() OVER (
+            PARTITION BY card_id ORDER BY checked_at DESC
+        ) AS _rn
+        FROM card_market_prices
+        WHERE card_id IN (SELECT value FROM json_each(?))
+    )
+    WHERE _rn <= ?
+    ORDER BY card_id, checked_at DESC
+"""
+SQL_INSERT_CARD = """
+    INSERT INTO user_cards (
+        id, user_id, player_name, team, year, card_set, card_number,
+        manufacturer, sport, condition, grading_company, grading_grade,
+        grading_cert_number, front_image_url, back_image_url,
+        purchase_price, estimated_value, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Single-row insert that hands the written row back; bulk inserts go through
+# executemany, which can't fetch RETURNING rows, so they keep SQL_INSERT_CARD
+SQL_INSERT_CARD_RETURNING = SQL_INSERT_CARD + "    RETURNING *\n"
+SQL_INSERT_MARKET_PRICE = """
+    INSERT INTO card_market_prices (
+        id, card_id, market_price, source, sample_size,
+        confidence_level, price_range_low, price_range_high, checked_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# get_user_cards: one page of cards with the filtered total computed in the
+# same statement, joined only for that page to each card's latest market price.
+# Built once per (filter by sport, after a cursor) combination.
+_SQL_LIST_USER_CARDS = """
+    SELECT page.*,
+           p.market_price AS mv_price,
+           p.confidence_level AS mv_conf,
+           p.checked_at AS mv_checked
+    FROM (
+        SELECT uc.*, COUNT(*) OVER () AS _total
+        FROM user_cards uc
+        WHERE {where}
+        ORDER BY uc.created_at DESC, uc.id DESC
+        LIMIT ? OFFSET ?
+    ) page
+    LEFT JOIN card_market_prices p ON p.id = (
+        SELECT id FROM card_market_prices
+        WHERE card_id = page.id
+        ORDER BY checked_at DESC
+        LIMIT 1
+    )
+    ORDER BY page.created_at DESC, page.id DESC
+"""
+_USER_CARDS_WHERE = {
+    False: "uc.user_id = ?",
+    True: "uc.user_id = ? AND uc.sport = ?"
+}
+SQL_LIST_USER_CARDS = {
+    (by_sport, after_cursor): _SQL_LIST_USER_CARDS.format(
+        where=where + (" AND (uc.created_at, uc.id) < (?, ?)" if after_cursor else "")
+    )
+    for by_sport, where in _USER_CARDS_WHERE.items()
+    for after_cursor in (False, True)
+}
+SQL_COUNT_USER_CARDS = {
+    by_sport: f"SELECT COUNT(*) FROM user_cards uc WHERE {where}"
+    for by_sport, where in _USER_CARDS_WHERE.items()
+}
+
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections: one read/write connection guarded by
+    a lock, plus up to max_readers read-only connections that WAL lets run
+    concurrently with the writer. Connections are opened lazily and reused.
+    """
+
+    def __init__(self, db_path: str, max_readers: int = READ_POOL_SIZE):
+        self.db_path = db_path
+        self.max_readers = max_readers
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_lock = threading.Lock()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            uri = f"file:{os.path.abspath(self.db_path)}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute(f"PRAGMA cache_size = {PAGE_CACHE_SIZE}")
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._reader_lock:
+            if self._reader_count < self.max_readers:
+                self._reader_count += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._connect(readonly=True)
+            except Exception:
+                with self._reader_lock:
+                    self._reader_count -= 1
+                raise
+
+        # Pool is at capacity; wait for a reader to be returned
+        return self._readers.get()
+
+    @contextmanager
+    def connection(self, readonly: bool = False):
+        """Check out a pooled connection for the duration of the block."""
+        if readonly:
+            conn = self._acquire_reader()
+            try:
+                yield conn
+            finally:
+                self._readers.put(conn)
+            return
+
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect(readonly=False)
+            conn = self._writer
+            try:
+                yield conn
+            finally:
+                # Never hand an open transaction to the next caller
+                if conn.in_transaction:
+                    conn.rollback()
+
+    def close(self):
+        """Close every pooled connection."""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._reader_lock:
+            self._reader_count = 0
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Get the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+def close_db():
+    """Close all pooled connections (call on shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
 @contextmanager
-def get_db():
-    """Get database connection context manager."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
+def get_db(readonly: bool = False):
+    """
+    Get a pooled database connection.
+
+    readonly=True checks out one of the concurrent read-only connections;
+    the default is the single read/write connection.
+    """
+    with get_pool().connection(readonly=readonly) as conn:
         yield conn
-    finally:
-        conn.close()
 
 def init_db():
     """Initialize the database with required tables."""
@@ -88,11 +319,21 @@ def init_db():
         """)
 
         # Create indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_cards_user_id ON user_cards(user_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_cards_sport ON user_cards(sport)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_cards_user_keyset ON user_cards(user_id, created_at DESC, id DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_cards_sport_keyset ON user_cards(user_id, sport, created_at DESC, id DESC)")
+        # No (id, user_id) index for the ownership checks: "WHERE id = ? AND
+        # user_id = ?" is a unique lookup on the primary key's autoindex, which
+        # the planner always prefers, so such an index would only cost writes.
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_card_market_prices_card_id ON card_market_prices(card_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_card_market_prices_checked_at ON card_market_prices(checked_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_mp_card_checked ON card_market_prices(card_id, checked_at DESC)")
+
+        # Indexes superseded by the composites above
+        cursor.execute("DROP INDEX IF EXISTS idx_user_cards_user_id")
+        cursor.execute("DROP INDEX IF EXISTS idx_user_cards_user_created")
+        cursor.execute("DROP INDEX IF EXISTS idx_user_cards_listing")
+        cursor.execute("DROP INDEX IF EXISTS idx_card_market_prices_card_id")
 
         conn.commit()
 
@@ -102,7 +343,7 @@ def init_db():
 
 def create_user(email: str, username: str, password_hash: str) -> Dict[str, Any]:
     """Create a new user."""
-    user_id = str(uuid.uuid4())
+    user_id = uuid.uuid4().hex
     now = datetime.utcnow().isoformat()
 
     with get_db() as conn:
@@ -117,25 +358,25 @@ def create_user(email: str, username: str, password_hash: str) -> Dict[str, Any]
 
 def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     """Get user by ID."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        cursor.execute(SQL_GET_USER_BY_ID, (user_id,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     """Get user by email."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE email = ?", (email.lower(),))
+        cursor.execute(SQL_GET_USER_BY_EMAIL, (email.lower(),))
         row = cursor.fetchone()
         return dict(row) if row else None
 
 def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
     """Get user by username."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
+        cursor.execute(SQL_GET_USER_BY_USERNAME, (username,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
@@ -162,9 +403,9 @@ def set_reset_token(user_id: str, token: str, expires: str):
 
 def get_user_by_reset_token(token: str) -> Optional[Dict[str, Any]]:
     """Get user by reset token."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE reset_token = ?", (token,))
+        cursor.execute(SQL_GET_USER_BY_RESET_TOKEN, (token,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
@@ -172,140 +413,255 @@ def get_user_by_reset_token(token: str) -> Optional[Dict[str, Any]]:
 # Card Functions
 # ============================================================================
 
+def _card_row(card_id: str, user_id: str, card_data: Dict[str, Any], now: str) -> tuple:
+    """Build the SQL_INSERT_CARD parameter tuple for one card."""
+    return (
+        card_id, user_id,
+        card_data.get("player_name"),
+        card_data.get("team"),
+        card_data.get("year"),
+        card_data.get("set"),
+        card_data.get("card_number"),
+        card_data.get("manufacturer"),
+        card_data.get("sport", "MLB"),
+        card_data.get("condition"),
+        card_data.get("grading_company"),
+        card_data.get("grading_grade"),
+        card_data.get("grading_cert_number"),
+        card_data.get("front_image_url"),
+        card_data.get("back_image_url"),
+        card_data.get("purchase_price"),
+        card_data.get("estimated_value"),
+        card_data.get("notes"),
+        now, now
+    )
+
 def create_card(user_id: str, card_data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new card in user's collection."""
-    card_id = str(uuid.uuid4())
+    card_id = uuid.uuid4().hex
     now = datetime.utcnow().isoformat()
 
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO user_cards (
-                id, user_id, player_name, team, year, card_set, card_number,
-                manufacturer, sport, condition, grading_company, grading_grade,
-                grading_cert_number, front_image_url, back_image_url,
-                purchase_price, estimated_value, notes, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            card_id, user_id,
-            card_data.get("player_name"),
-            card_data.get("team"),
-            card_data.get("year"),
-            card_data.get("set"),
-            card_data.get("card_number"),
-            card_data.get("manufacturer"),
-            card_data.get("sport", "MLB"),
-            card_data.get("condition"),
-            card_data.get("grading_company"),
-            card_data.get("grading_grade"),
-            card_data.get("grading_cert_number"),
-            card_data.get("front_image_url"),
-            card_data.get("back_image_url"),
-            card_data.get("purchase_price"),
-            card_data.get("estimated_value"),
-            card_data.get("notes"),
-            now, now
-        ))
+        cursor.execute(SQL_INSERT_CARD_RETURNING, _card_row(card_id, user_id, card_data, now))
+        row = cursor.fetchone()
+        conn.commit()
+
+    return dict(row)
+
+def create_cards_bulk(user_id: str, cards: List[Dict[str, Any]]) -> List[str]:
+    """
+    Create many cards in one transaction (collection imports).
+    Returns the new card IDs in input order.
+    """
+    if not cards:
+        return []
+
+    now = datetime.utcnow().isoformat()
+    card_ids = [uuid.uuid4().hex for _ in cards]
+    rows = [
+        _card_row(card_id, user_id, card_data, now)
+        for card_id, card_data in zip(card_ids, cards)
+    ]
+
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(SQL_INSERT_CARD, rows)
         conn.commit()
 
-    return get_card_by_id(card_id)
+    return card_ids
 
 def get_card_by_id(card_id: str) -> Optional[Dict[str, Any]]:
     """Get card by ID."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM user_cards WHERE id = ?", (card_id,))
+        cursor.execute(SQL_GET_CARD_BY_ID, (card_id,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
-def get_user_cards(user_id: str, page: int = 1, per_page: int = 50, sport: Optional[str] = None) -> Dict[str, Any]:
-    """Get all cards for a user with pagination."""
-    offset = (page - 1) * per_page
-
-    with get_db() as conn:
+def get_user_card(card_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+    """Get a card by ID, only if it belongs to the user."""
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
+        cursor.execute(SQL_GET_USER_CARD, (card_id, user_id))
+        row = cursor.fetchone()
+        return dict(row) if row else None
 
-        # Build query
-        query = "SELECT * FROM user_cards WHERE user_id = ?"
-        params = [user_id]
+def get_user_cards_by_ids(user_id: str, card_ids: List[str]) -> List[Dict[str, Any]]:
+    """Get the given cards, restricted to those owned by the user."""
+    if not card_ids:
+        return []
 
-        if sport:
-            query += " AND sport = ?"
-            params.append(sport)
+    placeholders = ",".join("?" * len(card_ids))
+    with get_db(readonly=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT * FROM user_cards
+            WHERE user_id = ? AND id IN ({placeholders})
+        """, [user_id, *card_ids])
+        rows = cursor.fetchall()
+        return [dict(row) for row in rows]
 
-        # Get total count
-        count_query = query.replace("SELECT *", "SELECT COUNT(*)")
-        cursor.execute(count_query, params)
-        total = cursor.fetchone()[0]
+def encode_cursor(created_at: str, card_id: str) -> str:
+    """Encode a keyset pagination cursor for the card list."""
+    return base64.urlsafe_b64encode(f"{created_at}|{card_id}".encode()).decode()
 
-        # Get cards with pagination
-        query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
-        params.extend([per_page, offset])
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor from encode_cursor. Raises ValueError if malformed."""
+    try:
+        created_at, card_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return created_at, card_id
+
+def get_user_cards(
+    user_id: str,
+    page: int = 1,
+    per_page: int = 50,
+    sport: Optional[str] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get all cards for a user with pagination.
+
+    Pass the next_cursor from a previous page as cursor to seek straight to
+    the following page (keyset pagination). page/OFFSET is kept for older
+    clients but gets slower the deeper the page.
+    """
+    offset = 0 if cursor else (page - 1) * per_page
+
+    with get_db(readonly=True) as conn:
+        db_cursor = conn.cursor()
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        params = [user_id]
+        if sport:
+            params.append(sport)
 
-        cards = [format_card(dict(row)) for row in rows]
+        page_params = list(params)
+        if cursor:
+            page_params.extend(decode_cursor(cursor))
+
+        db_cursor.execute(
+            SQL_LIST_USER_CARDS[bool(sport), bool(cursor)],
+            page_params + [per_page, offset]
+        )
+        rows = db_cursor.fetchall()
+
+        if rows and not cursor:
+            total = rows[0]["_total"]
+        elif rows or offset or cursor:
+            # The window total only covers rows after the cursor, and a page
+            # past the end has no rows to carry it, so count directly
+            db_cursor.execute(SQL_COUNT_USER_CARDS[bool(sport)], params)
+            total = db_cursor.fetchone()[0]
+        else:
+            total = 0
+
+        cards = []
+        for row in rows:
+            card = dict(row)
+            del card["_total"]
+            latest_price = None
+            if card["mv_checked"] is not None:
+                latest_price = {
+                    "market_price": card["mv_price"],
+                    "confidence_level": card["mv_conf"],
+                    "checked_at": card["mv_checked"]
+                }
+            cards.append(format_card(card, latest_price))
+
+        next_cursor = None
+        if len(rows) == per_page:
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
 
         return {
             "cards": cards,
             "total": total,
             "page": page,
-            "per_page": per_page
+            "per_page": per_page,
+            "next_cursor": next_cursor
         }
 
+# API field -> user_cards column for update_card, in SET-clause order
+UPDATABLE_CARD_FIELDS = {
+    "player_name": "player_name",
+    "team": "team",
+    "year": "year",
+    "set": "card_set",
+    "card_set": "card_set",
+    "card_number": "card_number",
+    "manufacturer": "manufacturer",
+    "sport": "sport",
+    "condition": "condition",
+    "grading_company": "grading_company",
+    "grading_grade": "grading_grade",
+    "grading_cert_number": "grading_cert_number",
+    "front_image_url": "front_image_url",
+    "back_image_url": "back_image_url",
+    "purchase_price": "purchase_price",
+    "estimated_value": "estimated_value",
+    "notes": "notes",
+}
+
+@functools.lru_cache(maxsize=128)
+def _update_card_sql(columns: Tuple[str, ...]) -> str:
+    """
+    Build the UPDATE for one set of columns. Clients tend to PATCH the same
+    few fields, so the string (and sqlite3's cached statement for it) is reused.
+    """
+    assignments = ", ".join(f"{column} = ?" for column in columns)
+    return f"""
+        UPDATE user_cards SET {assignments}, updated_at = ?
+        WHERE id = ? AND user_id = ?
+        RETURNING *
+    """
+
 def update_card(card_id: str, user_id: str, card_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Update a card."""
     now = datetime.utcnow().isoformat()
 
-    # Build SET clause dynamically
-    allowed_fields = [
-        "player_name", "team", "year", "card_set", "card_number",
-        "manufacturer", "sport", "condition", "grading_company",
-        "grading_grade", "grading_cert_number", "front_image_url",
-        "back_image_url", "purchase_price", "estimated_value", "notes"
-    ]
+    # Collect columns in UPDATABLE_CARD_FIELDS order; 'set' and 'card_set'
+    # both map to card_set, first one wins
+    values = {}
+    for field, column in UPDATABLE_CARD_FIELDS.items():
+        if field in card_data and column not in values:
+            values[column] = card_data[field]
 
-    updates = []
-    params = []
+    if not values:
+        return get_user_card(card_id, user_id)
 
-    for field in allowed_fields:
-        if field in card_data:
-            # Handle 'set' vs 'card_set' naming
-            db_field = "card_set" if field == "set" else field
-            updates.append(f"{db_field} = ?")
-            params.append(card_data[field])
-
-    if not updates:
-        return get_card_by_id(card_id)
-
-    updates.append("updated_at = ?")
-    params.append(now)
-    params.extend([card_id, user_id])
+    params = [*values.values(), now, card_id, user_id]
 
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute(f"""
-            UPDATE user_cards SET {', '.join(updates)}
-            WHERE id = ? AND user_id = ?
-        """, params)
+        cursor.execute(_update_card_sql(tuple(values)), params)
+        row = cursor.fetchone()
         conn.commit()
 
-        if cursor.rowcount == 0:
-            return None
-
-    return get_card_by_id(card_id)
+    return dict(row) if row else None
 
 def delete_card(card_id: str, user_id: str) -> bool:
     """Delete a card."""
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM user_cards WHERE id = ? AND user_id = ?", (card_id, user_id))
+        cursor.execute(SQL_DELETE_CARD, (card_id, user_id))
         conn.commit()
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    if deleted:
+        invalidate_latest_market_price(card_id)
+    return deleted
 
-def format_card(card: Dict[str, Any]) -> Dict[str, Any]:
-    """Format card for API response."""
+# Sentinel for format_card: look the latest market price up per card
+_LOOKUP_MARKET_PRICE = object()
+
+def format_card(card: Dict[str, Any], latest_price: Any = _LOOKUP_MARKET_PRICE) -> Dict[str, Any]:
+    """
+    Format card for API response.
+
+    Pass latest_price (a price dict or None) when it was already joined in,
+    to skip the per-card market price query.
+    """
     grading = None
     if card.get("grading_company") or card.get("grading_grade"):
         grading = {
@@ -316,7 +672,8 @@ def format_card(card: Dict[str, Any]) -> Dict[str, Any]:
 
     # Get latest market value if available
     market_value = None
-    latest_price = get_latest_market_price(card["id"])
+    if latest_price is _LOOKUP_MARKET_PRICE:
+        latest_price = get_latest_market_price(card["id"])
     if latest_price:
         market_value = {
             "currentValue": latest_price.get("market_price"),
@@ -349,62 +706,156 @@ def format_card(card: Dict[str, Any]) -> Dict[str, Any]:
 # Market Price Functions
 # ============================================================================
 
+def _market_price_row(price_id: str, card_id: str, price_data: Dict[str, Any], now: str) -> tuple:
+    """Build the SQL_INSERT_MARKET_PRICE parameter tuple for one price record."""
+    return (
+        price_id, card_id,
+        price_data["market_price"],
+        price_data.get("source", "ebay"),
+        price_data.get("sample_size", 0),
+        price_data.get("confidence_level", 0.0),
+        price_data.get("price_range_low"),
+        price_data.get("price_range_high"),
+        price_data.get("checked_at", now)
+    )
+
 def add_market_price(card_id: str, price_data: Dict[str, Any]) -> Dict[str, Any]:
     """Add a market price record for a card."""
-    price_id = str(uuid.uuid4())
+    price_id = uuid.uuid4().hex
     now = datetime.utcnow().isoformat()
 
     with get_db() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO card_market_prices (
-                id, card_id, market_price, source, sample_size,
-                confidence_level, price_range_low, price_range_high, checked_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            price_id, card_id,
-            price_data["market_price"],
-            price_data.get("source", "ebay"),
-            price_data.get("sample_size", 0),
-            price_data.get("confidence_level", 0.0),
-            price_data.get("price_range_low"),
-            price_data.get("price_range_high"),
-            now
-        ))
+        cursor.execute(SQL_INSERT_MARKET_PRICE, _market_price_row(price_id, card_id, price_data, now))
         conn.commit()
+    invalidate_latest_market_price(card_id)
 
     return get_market_price_by_id(price_id)
 
+def add_market_prices(prices: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Add market price records for several cards in a single transaction.
+
+    Also syncs each card's estimated_value to the new market price, so a bulk
+    refresh costs one commit instead of two per card.
+    """
+    if not prices:
+        return 0
+
+    now = datetime.utcnow().isoformat()
+    price_rows = [
+        _market_price_row(uuid.uuid4().hex, card_id, price_data, now)
+        for card_id, price_data in prices.items()
+    ]
+    value_rows = [
+        (price_data["market_price"], now, card_id)
+        for card_id, price_data in prices.items()
+    ]
+
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(SQL_INSERT_MARKET_PRICE, price_rows)
+        conn.executemany("""
+            UPDATE user_cards SET estimated_value = ?, updated_at = ?
+            WHERE id = ?
+        """, value_rows)
+        conn.commit()
+    invalidate_latest_market_price(*prices)
+
+    return len(price_rows)
+
+def add_market_prices_bulk(records: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+    """
+    Insert many price history records in one transaction (backfills).
+
+    Records are (card_id, price_data) pairs; a card may appear more than once,
+    and price_data may carry its own checked_at. Returns the new price IDs.
+    """
+    if not records:
+        return []
+
+    now = datetime.utcnow().isoformat()
+    price_ids = [uuid.uuid4().hex for _ in records]
+    rows = [
+        _market_price_row(price_id, card_id, price_data, now)
+        for price_id, (card_id, price_data) in zip(price_ids, records)
+    ]
+
+    with get_db() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(SQL_INSERT_MARKET_PRICE, rows)
+        conn.commit()
+    invalidate_latest_market_price(*{card_id for card_id, _ in records})
+
+    return price_ids
+
 def get_market_price_by_id(price_id: str) -> Optional[Dict[str, Any]]:
     """Get market price record by ID."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM card_market_prices WHERE id = ?", (price_id,))
+        cursor.execute(SQL_GET_MARKET_PRICE_BY_ID, (price_id,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
 def get_latest_market_price(card_id: str) -> Optional[Dict[str, Any]]:
-    """Get the most recent market price for a card."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM card_market_prices
-            WHERE card_id = ?
-            ORDER BY checked_at DESC
-            LIMIT 1
-        """, (card_id,))
-        row = cursor.fetchone()
-        return dict(row) if row else None
+    """Get the most recent market price for a card (cached for a few minutes)."""
+    fill = object()
+    with _latest_price_cache_lock:
+        if card_id in _latest_price_cache:
+            return _latest_price_cache[card_id]
+        _latest_price_fills[card_id] = fill
+
+    try:
+        with get_db(readonly=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute(SQL_GET_LATEST_MARKET_PRICE, (card_id,))
+            row = cursor.fetchone()
+            latest_price = dict(row) if row else None
+    except BaseException:
+        with _latest_price_cache_lock:
+            if _latest_price_fills.get(card_id) is fill:
+                del _latest_price_fills[card_id]
+        raise
+
+    with _latest_price_cache_lock:
+        # Our token is gone if the card was invalidated (or looked up again)
+        # since the miss; the row may predate that write, so don't cache it
+        if _latest_price_fills.get(card_id) is fill:
+            del _latest_price_fills[card_id]
+            _latest_price_cache[card_id] = latest_price
+    return latest_price
+
+def invalidate_latest_market_price(*card_ids: str):
+    """Drop cached latest prices for the given cards."""
+    with _latest_price_cache_lock:
+        for card_id in card_ids:
+            _latest_price_fills.pop(card_id, None)
+            _latest_price_cache.pop(card_id, None)
 
 def get_market_price_history(card_id: str, limit: int = 30) -> List[Dict[str, Any]]:
     """Get market price history for a card."""
-    with get_db() as conn:
+    with get_db(readonly=True) as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT * FROM card_market_prices
-            WHERE card_id = ?
-            ORDER BY checked_at DESC
-            LIMIT ?
-        """, (card_id, limit))
+        cursor.execute(SQL_GET_MARKET_PRICE_HISTORY, (card_id, limit))
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
+
+def get_market_price_histories(card_ids: List[str], limit: int = 30) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get market price history for many cards in one query.
+    Returns {card_id: history}, newest first, with an empty list for cards
+    that have no prices.
+    """
+    histories = {card_id: [] for card_id in card_ids}
+    if not card_ids:
+        return histories
+
+    with get_db(readonly=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(SQL_GET_MARKET_PRICE_HISTORIES, (json.dumps(card_ids), limit))
+        for row in cursor.fetchall():
+            price = dict(row)
+            del price["_rn"]
+            histories[price["card_id"]].append(price)
+
+    return histories
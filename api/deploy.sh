@@ -60,6 +60,13 @@ if [ -f ../.env ]; then
             echo "XIMILAR_API_KEY=$XIMILAR_API_KEY" >> .env
         echo "✅ Added XIMILAR_API_KEY"
     fi
+
+    if [ ! -z "$POSTMARK_API_KEY" ]; then
+        grep -q "POSTMARK_API_KEY=" .env && \
+            sed -i "s/POSTMARK_API_KEY=.*/POSTMARK_API_KEY=$POSTMARK_API_KEY/" .env || \
+            echo "POSTMARK_API_KEY=$POSTMARK_API_KEY" >> .env
+        echo "✅ Added POSTMARK_API_KEY"
+    fi
 fi
 EOF
 
@@ -6,18 +6,58 @@ Uses Postmark for reliable email delivery
 import httpx
 from typing import Optional
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+POSTMARK_API_KEY = os.environ.get("POSTMARK_API_KEY", "")
+
 
 class EmailService:
     def __init__(self):
-        self.api_key = "3b1bc9be-2a11-4e78-ad3f-04790b22c368"
+        self.api_key = POSTMARK_API_KEY
         self.api_url = "https://api.postmarkapp.com/email"
         self.from_email = "todd@fluxzi.com"
         self.to_email = "todd@fluxzi.com"
+        self._client: Optional[httpx.AsyncClient] = None
+
+        if not self.api_key:
+            logger.warning("POSTMARK_API_KEY is not set; contact and feedback emails will not be sent")
 
-    def send_contact_email(
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared Postmark client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={
+                    "Accept": "application/json",
+                    "Content-Type": "application/json",
+                    "X-Postmark-Server-Token": self.api_key
+                },
+                timeout=10.0
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send(self, payload: dict) -> bool:
+        """Post a message to Postmark, returning True on success."""
+        if not self.api_key:
+            logger.error("Cannot send email: POSTMARK_API_KEY is not set")
+            return False
+
+        response = await self._get_client().post(self.api_url, json=payload)
+
+        if response.status_code == 200:
+            return True
+
+        logger.error(f"Postmark error: {response.status_code} - {response.text}")
+        return False
+
+    async def send_contact_email(
         self,
         name: str,
         email: str,
@@ -40,36 +80,24 @@ Message:
 Reply to: {email}
 """
 
-            response = httpx.post(
-                self.api_url,
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                    "X-Postmark-Server-Token": self.api_key
-                },
-                json={
-                    "From": self.from_email,
-                    "To": self.to_email,
-                    "Subject": email_subject,
-                    "TextBody": email_body,
-                    "ReplyTo": email,
-                    "MessageStream": "outbound"
-                },
-                timeout=10.0
-            )
+            sent = await self._send({
+                "From": self.from_email,
+                "To": self.to_email,
+                "Subject": email_subject,
+                "TextBody": email_body,
+                "ReplyTo": email,
+                "MessageStream": "outbound"
+            })
 
-            if response.status_code == 200:
+            if sent:
                 logger.info(f"Contact email sent successfully via Postmark")
-                return True
-            else:
-                logger.error(f"Postmark error: {response.status_code} - {response.text}")
-                return False
+            return sent
 
         except Exception as e:
             logger.error(f"Failed to send contact email: {e}")
             return False
 
-    def send_feedback_email(
+    async def send_feedback_email(
         self,
         feedback_type: str,
         feedback: str,
@@ -102,23 +130,11 @@ Feedback:
             if email:
                 payload["ReplyTo"] = email
 
-            response = httpx.post(
-                self.api_url,
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                    "X-Postmark-Server-Token": self.api_key
-                },
-                json=payload,
-                timeout=10.0
-            )
+            sent = await self._send(payload)
 
-            if response.status_code == 200:
+            if sent:
                 logger.info(f"Feedback email sent successfully via Postmark")
-                return True
-            else:
-                logger.error(f"Postmark error: {response.status_code} - {response.text}")
-                return False
+            return sent
 
         except Exception as e:
             logger.error(f"Failed to send feedback email: {e}")
@@ -4,10 +4,17 @@ Handles card image uploads to S3 or local storage
 """
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, BinaryIO, Union
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import boto3
+import functools
+import multiprocessing
 import os
+import shutil
+import tempfile
 import uuid
 from datetime import datetime
 from PIL import Image
@@ -27,6 +34,23 @@ S3_BASE_URL = f"https://{S3_BUCKET}.s3.{AWS_REGION}.amazonaws.com"
 # Local storage fallback
 LOCAL_UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "..", "uploads")
 
+# Upload streaming
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+SPOOL_MAX_SIZE = 1024 * 1024  # Uploads larger than this spill to a temp file
+
+# Decoded size limits, checked from the image header before anything is
+# decoded. MAX_IMAGE_PIXELS also makes Pillow itself refuse larger images.
+MAX_IMAGE_DIMENSION = 10000
+MAX_IMAGE_PIXELS = 64_000_000
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+# Thumbnailing is CPU-bound, so it runs in worker processes instead of on the
+# event loop. Workers are spawned rather than forked because the API process
+# already has threadpool threads running.
+THUMBNAIL_WORKERS = int(os.environ.get("THUMBNAIL_WORKERS", os.cpu_count() or 1))
+_thumbnail_pool: Optional[ProcessPoolExecutor] = None
+
 # ============================================================================
 # Pydantic Models
 # ============================================================================
@@ -39,8 +63,9 @@ class ImageUploadResponse(BaseModel):
 # Helper Functions
 # ============================================================================
 
+@functools.lru_cache(maxsize=1)
 def get_s3_client():
-    """Get S3 client if configured."""
+    """Get the shared S3 client if configured (boto3 clients are thread-safe)."""
     if not AWS_ACCESS_KEY or not AWS_SECRET_KEY:
         return None
 
@@ -54,12 +79,69 @@ def get_s3_client():
 def generate_filename(user_id: str, side: str, extension: str = "jpg") -> str:
     """Generate a unique filename for the image."""
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    unique_id = str(uuid.uuid4())[:8]
+    unique_id = uuid.uuid4().hex[:8]
     return f"cards/{user_id}/{timestamp}_{unique_id}_{side}.{extension}"
 
-def create_thumbnail(image_data: bytes, max_size: tuple = (200, 280)) -> bytes:
-    """Create a thumbnail from image data."""
-    image = Image.open(io.BytesIO(image_data))
+async def spool_upload(upload: UploadFile) -> tempfile.SpooledTemporaryFile:
+    """
+    Copy an upload into a spooled temp file in fixed-size chunks, enforcing
+    MAX_UPLOAD_SIZE as it goes. Returns the spool rewound to the start.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    total = 0
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_UPLOAD_SIZE:
+            spool.close()
+            raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+def check_image_dimensions(image_file: BinaryIO):
+    """
+    Reject unreadable or oversized images using only the header (Image.open
+    is lazy), so decompression bombs never reach the decoder.
+    """
+    try:
+        width, height = Image.open(image_file).size
+    except Image.DecompressionBombError:
+        raise HTTPException(status_code=400, detail="Image dimensions too large")
+    except Exception:
+        raise HTTPException(status_code=400, detail="File must be an image")
+    finally:
+        image_file.seek(0)
+
+    if (width > MAX_IMAGE_DIMENSION or height > MAX_IMAGE_DIMENSION
+            or width * height > MAX_IMAGE_PIXELS):
+        raise HTTPException(status_code=400, detail="Image dimensions too large")
+
+def get_thumbnail_pool() -> ProcessPoolExecutor:
+    """Get the thumbnail process pool, creating it on first use."""
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        _thumbnail_pool = ProcessPoolExecutor(
+            max_workers=THUMBNAIL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _thumbnail_pool
+
+def shutdown_thumbnail_pool():
+    """Shut down the thumbnail process pool (called on app shutdown)."""
+    global _thumbnail_pool
+    if _thumbnail_pool is not None:
+        _thumbnail_pool.shutdown(cancel_futures=True)
+        _thumbnail_pool = None
+
+def create_thumbnail(image: Union[bytes, BinaryIO], max_size: tuple = (200, 280)) -> bytes:
+    """Create a thumbnail from image data or an image file object."""
+    if isinstance(image, bytes):
+        image = io.BytesIO(image)
+    image = Image.open(image)
+
+    # Let libjpeg scale JPEGs down by 1/2-1/8 while decoding rather than
+    # decoding the full-resolution image first (no-op for other formats)
+    image.draft("RGB", (max_size[0] * 2, max_size[1] * 2))
 
     # Convert to RGB if necessary
     if image.mode in ("RGBA", "P"):
@@ -73,26 +155,77 @@ def create_thumbnail(image_data: bytes, max_size: tuple = (200, 280)) -> bytes:
     image.save(output, format="JPEG", quality=85)
     return output.getvalue()
 
-async def upload_to_s3(s3_client, image_data: bytes, filename: str, content_type: str = "image/jpeg") -> str:
+def create_thumbnail_from_path(path: str) -> bytes:
+    """Create a thumbnail from the image file at path (thumbnail worker entry point)."""
+    with open(path, "rb") as image_file:
+        return create_thumbnail(image_file)
+
+def copy_to_named_file(image_file: BinaryIO) -> str:
+    """
+    Copy an image file to a named temp file in chunks and return its path;
+    the caller deletes it. The file is left rewound.
+    """
+    tmp = tempfile.NamedTemporaryFile(delete=False)
+    try:
+        with tmp:
+            shutil.copyfileobj(image_file, tmp, UPLOAD_CHUNK_SIZE)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+    finally:
+        image_file.seek(0)
+    return tmp.name
+
+async def thumbnail_upload(image_file: BinaryIO) -> Optional[bytes]:
+    """
+    Thumbnail an upload in a worker process. Returns None if the image
+    can't be thumbnailed.
+
+    The worker is handed a temp file path rather than the image bytes, so
+    the upload is never read into memory as one blob or pickled across the
+    process boundary.
+    """
+    path = await run_in_threadpool(copy_to_named_file, image_file)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            get_thumbnail_pool(), create_thumbnail_from_path, path
+        )
+    except Exception as e:
+        print(f"Thumbnail creation failed: {e}")
+        return None
+    finally:
+        os.unlink(path)
+
+@functools.lru_cache(maxsize=1024)
+def ensure_upload_dir(path: str):
+    """Create a local upload directory once; later uploads skip the syscalls."""
+    os.makedirs(path, exist_ok=True)
+
+async def upload_to_s3(s3_client, image_file: BinaryIO, filename: str, content_type: str = "image/jpeg") -> str:
     """Upload image to S3 and return URL."""
-    s3_client.put_object(
-        Bucket=S3_BUCKET,
-        Key=filename,
-        Body=image_data,
-        ContentType=content_type,
-        ACL="public-read"
+    await run_in_threadpool(
+        s3_client.upload_fileobj,
+        image_file,
+        S3_BUCKET,
+        filename,
+        ExtraArgs={
+            "ContentType": content_type,
+            "ACL": "public-read"
+        }
     )
     return f"{S3_BASE_URL}/{filename}"
 
-async def upload_locally(image_data: bytes, filename: str) -> str:
+async def upload_locally(image_file: BinaryIO, filename: str) -> str:
     """Upload image to local storage and return URL."""
-    # Create directory structure
     full_path = os.path.join(LOCAL_UPLOAD_DIR, filename)
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-    # Write file
-    with open(full_path, "wb") as f:
-        f.write(image_data)
+    # Create directory structure and write file off the event loop
+    def write_file():
+        ensure_upload_dir(os.path.dirname(full_path))
+        with open(full_path, "wb") as f:
+            shutil.copyfileobj(image_file, f, UPLOAD_CHUNK_SIZE)
+
+    await run_in_threadpool(write_file)
 
     # Return absolute URL with API base
     api_base = os.environ.get("API_BASE_URL", "https://api.collectorstream.com")
@@ -118,39 +251,40 @@ async def upload_image(
     if not image.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    # Read image data
-    image_data = await image.read()
+    # Stream image data to a spooled temp file (size is checked while reading)
+    image_file = await spool_upload(image)
 
-    # Validate file size (max 10MB)
-    if len(image_data) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="Image too large (max 10MB)")
+    try:
+        check_image_dimensions(image_file)
+        return await store_image(image_file, image.content_type, side, current_user["id"])
+    finally:
+        image_file.close()
 
+async def store_image(image_file: BinaryIO, content_type: str, side: str, user_id: str) -> ImageUploadResponse:
+    """Thumbnail and store an uploaded image, in S3 if configured, else locally."""
     # Generate filename
     extension = "jpg"
-    if image.content_type == "image/png":
+    if content_type == "image/png":
         extension = "png"
 
-    filename = generate_filename(current_user["id"], side, extension)
+    filename = generate_filename(user_id, side, extension)
     thumbnail_filename = filename.replace(f".{extension}", f"_thumb.jpg")
 
-    # Create thumbnail
-    try:
-        thumbnail_data = create_thumbnail(image_data)
-    except Exception as e:
-        print(f"Thumbnail creation failed: {e}")
-        thumbnail_data = None
+    # Create thumbnail in a worker process
+    thumbnail_data = await thumbnail_upload(image_file)
 
-    # Upload to S3 or local storage
+    # Upload to S3 or local storage; the original and thumbnail go up concurrently
     s3_client = get_s3_client()
 
     if s3_client:
         # Upload to S3
         try:
-            url = await upload_to_s3(s3_client, image_data, filename, image.content_type)
-            thumbnail_url = None
-
+            uploads = [upload_to_s3(s3_client, image_file, filename, content_type)]
             if thumbnail_data:
-                thumbnail_url = await upload_to_s3(s3_client, thumbnail_data, thumbnail_filename)
+                uploads.append(upload_to_s3(s3_client, io.BytesIO(thumbnail_data), thumbnail_filename))
+
+            url, *thumbnail_urls = await asyncio.gather(*uploads)
+            thumbnail_url = thumbnail_urls[0] if thumbnail_urls else None
 
             return ImageUploadResponse(url=url, thumbnailUrl=thumbnail_url)
         except Exception as e:
@@ -159,11 +293,12 @@ async def upload_image(
     else:
         # Upload locally
         try:
-            url = await upload_locally(image_data, filename)
-            thumbnail_url = None
-
+            uploads = [upload_locally(image_file, filename)]
             if thumbnail_data:
-                thumbnail_url = await upload_locally(thumbnail_data, thumbnail_filename)
+                uploads.append(upload_locally(io.BytesIO(thumbnail_data), thumbnail_filename))
+
+            url, *thumbnail_urls = await asyncio.gather(*uploads)
+            thumbnail_url = thumbnail_urls[0] if thumbnail_urls else None
 
             return ImageUploadResponse(url=url, thumbnailUrl=thumbnail_url)
         except Exception as e:
@@ -13,11 +13,13 @@ import os
 
 from auth import router as auth_router
 from cards import router as cards_router
-from images import router as images_router
+from images import router as images_router, shutdown_thumbnail_pool
 from admin import router as admin_router
 from recommendations import router as recommendations_router
 from contact import router as contact_router
-from database import init_db
+from email_service import email_service
+from market_value import close_market_fetcher
+from database import init_db, close_db
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -25,6 +27,10 @@ async def lifespan(app: FastAPI):
     init_db()
     yield
     # Shutdown
+    shutdown_thumbnail_pool()
+    await email_service.aclose()
+    await close_market_fetcher()
+    close_db()
 
 app = FastAPI(
     title="CollectorStream API",
@@ -33,15 +39,23 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# CORS middleware - restricted to production domains
+# CORS middleware - restricted to production domains unless overridden
+# with a comma-separated CORS_ORIGINS
+DEFAULT_CORS_ORIGINS = [
+    "https://collectorstream.com",
+    "https://www.collectorstream.com",
+    "https://api.collectorstream.com",
+    "http://localhost:3000",  # For local development
+]
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "").split(",")
+    if origin.strip()
+] or DEFAULT_CORS_ORIGINS
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://collectorstream.com",
-        "https://www.collectorstream.com",
-        "https://api.collectorstream.com",
-        "http://localhost:3000",  # For local development
-    ],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
     allow_headers=["*"],
@@ -4,15 +4,114 @@ Fetches real sold comps from eBay Browse API
 """
 
 import os
+import re
+import json
+import time
+import asyncio
+import random
 import httpx
-import statistics
-from typing import Optional, Dict, List, Any
+import numpy as np
+import orjson
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime, timedelta
+from cachetools import TTLCache
 
 # eBay API Configuration
 EBAY_APP_ID = os.environ.get("EBAY_APP_ID", "")
 EBAY_CERT_ID = os.environ.get("EBAY_CERT_ID", "")
 EBAY_API_URL = "https://api.ebay.com/buy/browse/v1"
+EBAY_TOKEN_URL = "https://api.ebay.com/identity/v1/oauth2/token"
+
+# OAuth token shared by every worker and kept across restarts
+EBAY_TOKEN_CACHE_PATH = os.environ.get(
+    "EBAY_TOKEN_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "ebay_token.json")
+)
+
+# Outbound eBay request rate per worker (token bucket), and how often a
+# throttled (429) request is retried with exponential backoff
+EBAY_RATE_LIMIT = float(os.environ.get("EBAY_RATE_LIMIT", 5))  # requests/second
+EBAY_MAX_RETRIES = 3
+EBAY_MAX_BACKOFF = 30.0
+
+# Sold comps per normalized search query; cards that build the same query
+# (duplicates, set collectors) share one eBay lookup within the TTL
+SOLD_COMPS_CACHE_TTL = 3600
+
+# Category appended to the search query for each sport (and league alias)
+SPORT_SEARCH_SUFFIX = {
+    "baseball": "baseball card",
+    "mlb": "baseball card",
+    "basketball": "basketball card",
+    "nba": "basketball card",
+    "football": "football card",
+    "nfl": "football card",
+    "hockey": "hockey card",
+    "nhl": "hockey card",
+}
+
+# Listing titles to skip: lots/bundles and reprints. Word boundaries keep
+# e.g. "Charlotte" or "Pilot" from matching "lot".
+EXCLUDED_TITLE_RE = re.compile(
+    r"\b(?:lots?|bundles?|set of|reprints?|reproductions?|tribute)\b",
+    re.IGNORECASE
+)
+# Graded slabs (PSA, BGS/Beckett, CGC, SGC), including "PSA10" style titles
+GRADED_TITLE_RE = re.compile(r"\b(?:psa|bgs|beckett|cgc|sgc)(?![a-z])", re.IGNORECASE)
+
+# Grading companies that appear in titles under more than one name
+GRADING_COMPANY_ALIASES = {
+    "bgs": "bgs|beckett",
+    "beckett": "bgs|beckett",
+}
+
+# Comps whose modified z-score (distance from the median in robust standard
+# deviations, estimated from the median absolute deviation) exceeds this
+# are dropped as outliers (Hampel filter / Iglewicz-Hoaglin cutoff)
+OUTLIER_MAD_THRESHOLD = 3.5
+
+
+def graded_title_pattern(company: str, grade: Optional[str] = None) -> re.Pattern:
+    """
+    Regex matching listing titles of slabs from the given grading company
+    with the given grade, e.g. "PSA 10", "PSA10", "BGS 9.5", "PSA GEM MINT 10".
+    Without a grade, any slab from the company matches.
+    """
+    company = company.strip().lower()
+    names = GRADING_COMPANY_ALIASES.get(company, re.escape(company))
+
+    number = re.search(r"\d+(?:\.\d+)?", str(grade)) if grade else None
+    if number:
+        value = float(number.group())
+        grade_text = str(int(value)) if value.is_integer() else str(value)
+        # "9" must not match "9.5" (or "10" match "100")
+        tail = rf"[\s-]*(?:gem[\s-]*(?:mint|mt)[\s-]*)?{re.escape(grade_text)}(?!\.?\d)"
+    else:
+        tail = r"(?![a-z])"
+
+    return re.compile(rf"\b(?:{names}){tail}", re.IGNORECASE)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second, bursting up to `rate`."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
 
 
 class MarketValueFetcher:
@@ -23,19 +122,99 @@ class MarketValueFetcher:
         self.cert_id = EBAY_CERT_ID
         self.access_token = None
         self.token_expires = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._comps_cache: TTLCache = TTLCache(maxsize=10_000, ttl=SOLD_COMPS_CACHE_TTL)
+        self._comps_inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._rate_limiter = TokenBucket(EBAY_RATE_LIMIT)
+        self._token_lock = asyncio.Lock()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared eBay client, creating it on first use (keeps connections alive)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the shared client (called on app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send an eBay request through the rate limiter, retrying 429s with
+        exponential backoff (or the server's Retry-After, if given).
+        """
+        for attempt in range(EBAY_MAX_RETRIES + 1):
+            await self._rate_limiter.acquire()
+            response = await self._get_client().request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == EBAY_MAX_RETRIES:
+                return response
+
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                delay = 2 ** attempt + random.uniform(0, 0.5)
+            print(f"⏳ eBay rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(min(delay, EBAY_MAX_BACKOFF))
+
+    def _load_cached_token(self) -> bool:
+        """Load a still-valid token saved by another worker or a previous run."""
+        try:
+            with open(EBAY_TOKEN_CACHE_PATH) as f:
+                cached = json.load(f)
+            access_token = cached["access_token"]
+            expires_at = float(cached["expires_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+
+        if expires_at <= time.time():
+            return False
+
+        self.access_token = access_token
+        self.token_expires = datetime.utcfromtimestamp(expires_at)
+        return True
+
+    def _save_cached_token(self, expires_at: float):
+        """Save the token for other workers; written atomically, owner-only."""
+        tmp_path = f"{EBAY_TOKEN_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(EBAY_TOKEN_CACHE_PATH), exist_ok=True)
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({"access_token": self.access_token, "expires_at": expires_at}, f)
+            os.replace(tmp_path, EBAY_TOKEN_CACHE_PATH)
+        except OSError as e:
+            print(f"⚠️ Could not cache eBay token: {e}")
+
+    def _has_valid_token(self) -> bool:
+        """Whether the in-memory token is set and not yet expired."""
+        return bool(self.access_token and self.token_expires and datetime.utcnow() < self.token_expires)
 
     async def get_oauth_token(self) -> str:
         """Get OAuth token for eBay API"""
         # Check if we have a valid cached token
-        if self.access_token and self.token_expires and datetime.utcnow() < self.token_expires:
+        if self._has_valid_token():
             return self.access_token
 
-        # Get new token
-        token_url = "https://api.ebay.com/identity/v1/oauth2/token"
+        # Concurrent lookups that all find the token expired wait for a single
+        # refresh, then re-check instead of each requesting a new token
+        async with self._token_lock:
+            if self._has_valid_token():
+                return self.access_token
+
+            # Reuse a token another worker (or a previous run) already fetched
+            if self._load_cached_token():
+                return self.access_token
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                token_url,
+            # Get new token
+            response = await self._request(
+                "POST",
+                EBAY_TOKEN_URL,
                 headers={
                     "Content-Type": "application/x-www-form-urlencoded",
                 },
@@ -43,8 +222,7 @@ class MarketValueFetcher:
                 data={
                     "grant_type": "client_credentials",
                     "scope": "https://api.ebay.com/oauth/api_scope"
-                },
-                timeout=30.0
+                }
             )
 
             if response.status_code != 200:
@@ -55,6 +233,7 @@ class MarketValueFetcher:
             # Token expires in seconds, cache it with 5min buffer
             expires_in = data.get("expires_in", 7200) - 300
             self.token_expires = datetime.utcnow() + timedelta(seconds=expires_in)
+            self._save_cached_token(time.time() + expires_in)
 
             return self.access_token
 
@@ -75,103 +254,142 @@ class MarketValueFetcher:
             parts.append(f"#{card['card_number']}")
 
         # Add sport category for better filtering
-        sport = card.get("sport", "").lower()
-        if sport in ["baseball", "mlb"]:
-            parts.append("baseball card")
-        elif sport in ["basketball", "nba"]:
-            parts.append("basketball card")
-        elif sport in ["football", "nfl"]:
-            parts.append("football card")
-        elif sport in ["hockey", "nhl"]:
-            parts.append("hockey card")
+        sport = card.get("sport")
+        if sport:
+            suffix = SPORT_SEARCH_SUFFIX.get(sport.lower())
+            if suffix:
+                parts.append(suffix)
 
         return " ".join(parts)
 
-    async def fetch_sold_comps(self, card: Dict[str, Any], limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch sold comps from eBay for a card"""
-        token = await self.get_oauth_token()
+    async def fetch_sold_comps(self, card: Dict[str, Any], limit: int = 50) -> List[Tuple[str, float]]:
+        """
+        Fetch sold comps from eBay for a card as (title, price) pairs.
+        Results are cached per normalized query, and concurrent lookups of
+        the same query share one request. Callers must not mutate the list.
+        """
         query = self.build_search_query(card)
+        key = (" ".join(query.lower().split()), limit)
+
+        cached = self._comps_cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._comps_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search_sold_comps(query, limit))
+            self._comps_inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_comps_lookup(key, done))
+
+        # Shielded so one caller's cancellation doesn't cancel the shared lookup
+        return await asyncio.shield(task)
+
+    def _finish_comps_lookup(self, key: Tuple[str, int], task: asyncio.Future):
+        """Drop a finished lookup from in-flight and cache it if it succeeded."""
+        self._comps_inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._comps_cache[key] = task.result()
+
+    async def _search_sold_comps(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        """Run an eBay sold-listings search and project it to (title, price) pairs"""
+        token = await self.get_oauth_token()
 
         print(f"🔍 Searching eBay for: {query}")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{EBAY_API_URL}/item_summary/search",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "X-EBAY-C-MARKETPLACE-ID": "EBAY_US"
-                },
-                params={
-                    "q": query,
-                    "filter": "buyingOptions:{FIXED_PRICE|AUCTION},itemEndDate:[..],priceCurrency:USD",
-                    "sort": "endDate",  # Most recent first
-                    "limit": limit
-                },
-                timeout=30.0
-            )
+        response = await self._request(
+            "GET",
+            f"{EBAY_API_URL}/item_summary/search",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "X-EBAY-C-MARKETPLACE-ID": "EBAY_US"
+            },
+            params={
+                "q": query,
+                "filter": "buyingOptions:{FIXED_PRICE|AUCTION},itemEndDate:[..],priceCurrency:USD",
+                "sort": "endDate",  # Most recent first
+                "limit": limit
+            }
+        )
 
-            if response.status_code != 200:
-                print(f"❌ eBay API error: {response.status_code}")
-                print(f"   Response: {response.text}")
-                raise Exception(f"eBay API failed: {response.status_code}")
+        if response.status_code != 200:
+            print(f"❌ eBay API error: {response.status_code}")
+            print(f"   Response: {response.text}")
+            raise Exception(f"eBay API failed: {response.status_code}")
 
-            data = response.json()
-            items = data.get("itemSummaries", [])
+        data = orjson.loads(response.content)
+        items = data.get("itemSummaries", [])
+
+        # Keep only what filter_comps needs; listings without a price are useless
+        comps = []
+        for item in items:
+            price_info = item.get("price")
+            if price_info and "value" in price_info:
+                comps.append((item.get("title", ""), float(price_info["value"])))
 
-            print(f"✅ Found {len(items)} sold listings")
-            return items
+        print(f"✅ Found {len(items)} sold listings")
+        return comps
 
-    def filter_comps(self, items: List[Dict[str, Any]]) -> List[float]:
+    def filter_comps(
+        self,
+        comps: List[Tuple[str, float]],
+        grading_company: Optional[str] = None,
+        grading_grade: Optional[str] = None
+    ) -> List[float]:
         """
         Filter sold comps to remove outliers and invalid listings
 
         Removes:
         - Lots (multiple cards)
         - Reprints
-        - Graded cards (unless we're pricing a graded card)
-        - Extreme outliers (> 2 std dev from median)
+        - Graded cards when pricing a raw card; when pricing a graded card,
+          everything but slabs from the same company with the same grade
+        - Extreme outliers (modified z-score > OUTLIER_MAD_THRESHOLD)
         """
-        prices = []
-
-        for item in items:
-            title = item.get("title", "").lower()
-
-            # Skip lots
-            if "lot" in title or "bundle" in title or "set of" in title:
-                continue
+        if grading_company and grading_company.strip():
+            same_grade_re = graded_title_pattern(grading_company, grading_grade)
+        else:
+            same_grade_re = None
 
-            # Skip reprints
-            if "reprint" in title or "reproduction" in title or "tribute" in title:
-                continue
+        prices = []
 
-            # Skip graded cards (PSA, BGS, CGC, SGC)
-            # TODO: Only skip if our card is NOT graded
-            if any(grade in title for grade in ["psa", "bgs", "beckett", "cgc", "sgc"]):
+        for title, price in comps:
+            if title:
+                # Skip lots and reprints
+                if EXCLUDED_TITLE_RE.search(title):
+                    continue
+
+                if same_grade_re is None:
+                    # Raw card: skip graded cards (PSA, BGS, CGC, SGC)
+                    if GRADED_TITLE_RE.search(title):
+                        continue
+                elif not same_grade_re.search(title):
+                    # Graded card: only the same company and grade compare
+                    continue
+            elif same_grade_re is not None:
                 continue
 
-            # Get price
-            price_info = item.get("price", {})
-            if price_info and "value" in price_info:
-                price = float(price_info["value"])
-                if price > 0:
-                    prices.append(price)
+            if price > 0:
+                prices.append(price)
 
         if not prices:
             return prices
 
-        # Remove statistical outliers (> 2 standard deviations from median)
+        # Remove statistical outliers. Unlike a std-dev cutoff, the median
+        # absolute deviation isn't inflated by the outliers being removed.
         if len(prices) >= 5:
-            median = statistics.median(prices)
-            stdev = statistics.stdev(prices)
+            arr = np.asarray(prices, dtype=np.float64)
+            deviations = np.abs(arr - np.median(arr))
+            mad = np.median(deviations)
+            # 1.4826 * MAD estimates the std dev; when over half the comps
+            # share one price MAD is 0, so fall back to the mean deviation
+            scale = 1.4826 * mad if mad else 1.2533 * deviations.mean()
 
-            filtered_prices = [
-                p for p in prices
-                if abs(p - median) <= 2 * stdev
-            ]
+            if scale:
+                filtered_prices = arr[deviations <= OUTLIER_MAD_THRESHOLD * scale].tolist()
 
-            if filtered_prices:
-                print(f"📊 Filtered {len(prices)} → {len(filtered_prices)} comps (removed outliers)")
-                return filtered_prices
+                if filtered_prices:
+                    print(f"📊 Filtered {len(prices)} → {len(filtered_prices)} comps (removed outliers)")
+                    return filtered_prices
 
         return prices
 
@@ -189,11 +407,24 @@ class MarketValueFetcher:
                 "price_range_high": None
             }
 
+        # Select the median and 25th/75th percentile ranks in one O(n)
+        # partition instead of sorting
+        sample_size = len(prices)
+        mid = sample_size // 2
+        low_idx = int(sample_size * 0.25)
+        high_idx = int(sample_size * 0.75)
+        ranks = {low_idx, mid, high_idx}
+        if sample_size % 2 == 0:
+            ranks.add(mid - 1)
+        partitioned = np.partition(np.asarray(prices, dtype=np.float64), sorted(ranks))
+
         # Use median as the market price (more robust than mean)
-        market_price = statistics.median(prices)
+        if sample_size % 2:
+            market_price = float(partitioned[mid])
+        else:
+            market_price = float((partitioned[mid - 1] + partitioned[mid]) / 2)
 
         # Confidence based on sample size
-        sample_size = len(prices)
         if sample_size >= 20:
             confidence = 0.9
         elif sample_size >= 10:
@@ -204,12 +435,8 @@ class MarketValueFetcher:
             confidence = 0.4
 
         # Price range (25th to 75th percentile)
-        sorted_prices = sorted(prices)
-        low_idx = int(len(sorted_prices) * 0.25)
-        high_idx = int(len(sorted_prices) * 0.75)
-
-        price_range_low = sorted_prices[low_idx] if low_idx < len(sorted_prices) else sorted_prices[0]
-        price_range_high = sorted_prices[high_idx] if high_idx < len(sorted_prices) else sorted_prices[-1]
+        price_range_low = float(partitioned[low_idx])
+        price_range_high = float(partitioned[high_idx])
 
         print(f"💰 Market Value: ${market_price:.2f}")
         print(f"   Range: ${price_range_low:.2f} - ${price_range_high:.2f}")
@@ -236,10 +463,14 @@ class MarketValueFetcher:
         """
         try:
             # Fetch sold comps
-            items = await self.fetch_sold_comps(card)
+            comps = await self.fetch_sold_comps(card)
 
             # Filter to valid comps
-            prices = self.filter_comps(items)
+            prices = self.filter_comps(
+                comps,
+                grading_company=card.get("grading_company"),
+                grading_grade=card.get("grading_grade")
+            )
 
             # Calculate market value
             market_value = self.calculate_market_value(prices)
@@ -268,3 +499,8 @@ def get_market_fetcher() -> MarketValueFetcher:
     if _fetcher is None:
         _fetcher = MarketValueFetcher()
     return _fetcher
+
+async def close_market_fetcher():
+    """Close the global fetcher's HTTP client (called on app shutdown)."""
+    if _fetcher is not None:
+        await _fetcher.aclose()
@@ -4,19 +4,29 @@ Analyzes price trends, volatility, and momentum to provide buy/hold/sell recomme
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, List, Any, Optional
-import statistics
 from datetime import datetime, timedelta
+from cachetools import TTLCache
+import threading
+import numpy as np
 from auth import get_current_user
-from database import get_card_by_id, get_market_price_history, get_user_cards
+from database import get_user_card, get_market_price_histories, get_latest_market_price, get_user_cards
 
 router = APIRouter()
 
+# Trend metrics per card, keyed by (card_id, checked_at of its latest price):
+# a new price changes the key, so only the history analysis is cached and
+# ROI/days-held are still evaluated fresh on every request
+RECOMMENDATION_CACHE_TTL = 600
+_trend_metrics_cache: TTLCache = TTLCache(maxsize=50_000, ttl=RECOMMENDATION_CACHE_TTL)
+_trend_metrics_cache_lock = threading.Lock()
+
 # ============================================================================
 # Trend Analysis Functions
 # ============================================================================
 
-def calculate_trend(prices: List[float], days: int) -> float:
+def calculate_trend(prices: np.ndarray, days: int) -> float:
     """Calculate percentage change over a period."""
     if len(prices) < 2:
         return 0.0
@@ -33,40 +43,35 @@ def calculate_trend(prices: List[float], days: int) -> float:
     if first_price == 0:
         return 0.0
 
-    return ((last_price - first_price) / first_price) * 100
+    return float((last_price - first_price) / first_price * 100)
 
 
-def calculate_volatility(prices: List[float]) -> float:
+def calculate_volatility(prices: np.ndarray) -> float:
     """Calculate volatility as coefficient of variation (std dev / mean)."""
     if len(prices) < 2:
         return 0.0
 
-    try:
-        mean = statistics.mean(prices)
-        if mean == 0:
-            return 0.0
-
-        stdev = statistics.stdev(prices)
-        return (stdev / mean) * 100
-    except statistics.StatisticsError:
+    mean = prices.mean()
+    if mean == 0:
         return 0.0
 
+    stdev = prices.std(ddof=1)
+    return float(stdev / mean * 100)
 
-def detect_momentum(prices: List[float]) -> str:
-    """Detect momentum: ACCELERATING, DECELERATING, or STEADY."""
-    if len(prices) < 3:
-        return "STEADY"
 
-    # Split into two halves and compare trends
+def detect_momentum(prices: np.ndarray) -> str:
+    """Detect momentum: ACCELERATING, DECELERATING, or STEADY."""
+    # Compare the % change across the first half with the % change across
+    # the second half; each only needs the half's endpoints
     mid = len(prices) // 2
-    first_half = prices[:mid]
-    second_half = prices[mid:]
-
-    if len(first_half) < 2 or len(second_half) < 2:
+    if mid < 2:
         return "STEADY"
 
-    trend_first = calculate_trend(first_half, len(first_half))
-    trend_second = calculate_trend(second_half, len(second_half))
+    first_start, first_end = prices[0], prices[mid - 1]
+    second_start, second_end = prices[mid], prices[-1]
+
+    trend_first = (first_end - first_start) / first_start * 100 if first_start else 0.0
+    trend_second = (second_end - second_start) / second_start * 100 if second_start else 0.0
 
     difference = abs(trend_second - trend_first)
 
@@ -92,7 +97,11 @@ def analyze_card_trends(card: Dict[str, Any], price_history: List[Dict[str, Any]
 
     # Sort by date (oldest first)
     sorted_history = sorted(price_history, key=lambda x: x.get("checked_at", ""))
-    prices = [h.get("market_price", 0) for h in sorted_history]
+    prices = np.fromiter(
+        (h.get("market_price") or 0 for h in sorted_history),
+        dtype=np.float64,
+        count=len(sorted_history)
+    )
 
     return {
         "trend_7d": calculate_trend(prices, 7),
@@ -104,136 +113,177 @@ def analyze_card_trends(card: Dict[str, Any], price_history: List[Dict[str, Any]
     }
 
 
-def calculate_days_held(card: Dict[str, Any]) -> int:
-    """Calculate number of days card has been held."""
+def get_trend_metrics(
+    cards: List[Dict[str, Any]],
+    latest_checked: List[Optional[str]]
+) -> List[Dict[str, Any]]:
+    """
+    Trend metrics for each card, given the checked_at of each card's latest
+    market price (None if it has none). Cached metrics are reused; the
+    price histories of the rest are fetched in one query.
+    """
+    keys = [(card["id"], checked_at) for card, checked_at in zip(cards, latest_checked)]
+    with _trend_metrics_cache_lock:
+        metrics = [_trend_metrics_cache.get(key) for key in keys]
+
+    # Cards without any price have an empty history, no need to query
+    missing = [i for i, m in enumerate(metrics) if m is None]
+    to_fetch = [cards[i]["id"] for i in missing if latest_checked[i] is not None]
+    histories = get_market_price_histories(to_fetch, limit=365) if to_fetch else {}
+
+    for i in missing:
+        metrics[i] = analyze_card_trends(cards[i], histories.get(cards[i]["id"], []))
+
+    with _trend_metrics_cache_lock:
+        for i in missing:
+            _trend_metrics_cache[keys[i]] = metrics[i]
+
+    return metrics
+
+
+def calculate_days_held(card: Dict[str, Any], now: Optional[datetime] = None) -> int:
+    """Calculate number of days card has been held (as of now, default utcnow)."""
     try:
         created_at = card.get("created_at") or card.get("createdAt")
         if not created_at:
             return 0
 
         created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        days = (datetime.utcnow() - created_date).days
+        days = ((now or datetime.utcnow()) - created_date).days
         return max(0, days)
     except Exception:
         return 0
 
 
-def generate_recommendation(card: Dict[str, Any], metrics: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate buy/hold/sell recommendation based on trends and metrics."""
-
-    purchase_price = float(card.get("purchase_price") or card.get("purchasePrice") or 0)
-    estimated_value = float(card.get("estimated_value") or card.get("estimatedValue") or 0)
-
-    if purchase_price == 0:
-        return {
-            "action": "HOLD",
-            "confidence": 0.3,
-            "reasoning": "Unable to calculate ROI without purchase price data.",
-            "category": "UNKNOWN",
-            "metrics": metrics
-        }
-
-    profit = estimated_value - purchase_price
-    roi = (profit / purchase_price) * 100
-    days_held = calculate_days_held(card)
-
-    trend_7d = metrics.get("trend_7d", 0)
-    trend_30d = metrics.get("trend_30d", 0)
-    trend_90d = metrics.get("trend_90d", 0)
-    momentum = metrics.get("momentum", "STEADY")
-    volatility = metrics.get("volatility", 0)
-
-    # SELL Logic: Take profits on winners
-    if roi > 50 and trend_30d < -5:
-        return {
-            "action": "SELL",
-            "confidence": 0.85,
-            "reasoning": f"Strong profit ({roi:.1f}% ROI) with recent downtrend. Lock in gains while value is high.",
-            "category": "TAKE_PROFIT",
-            "metrics": metrics
-        }
+# Recommendation rules, checked in order; the first match wins.
+# (action, confidence, category, reasoning template)
+RECOMMENDATION_RULES = [
+    # No purchase price, ROI can't be computed
+    ("HOLD", 0.3, "UNKNOWN",
+     "Unable to calculate ROI without purchase price data."),
+
+    # SELL: Take profits on winners
+    ("SELL", 0.85, "TAKE_PROFIT",
+     "Strong profit ({roi:.1f}% ROI) with recent downtrend. Lock in gains while value is high."),
+    ("SELL", 0.8, "QUICK_FLIP",
+     "Quick flip opportunity ({roi:.1f}% in {days_held} days) showing weakness. Exit before reversal."),
+
+    # CUT_LOSS: Exit losing positions
+    ("CUT_LOSS", 0.9, "CUT_LOSS",
+     "Significant loss ({roi:.1f}%) with continuing downtrend. Cut losses to preserve capital."),
+    ("CUT_LOSS", 0.85, "CUT_LOSS",
+     "Loss accelerating ({roi:.1f}% ROI, {momentum} momentum). Exit before further decline."),
+
+    # BUY_MORE: Average down or add to winners
+    ("BUY_MORE", 0.8, "RECOVERY",
+     "Strong recovery trend (+{trend_30d:.1f}% over 30d) after dip. Average down while momentum builds."),
+    ("BUY_MORE", 0.75, "RECOVERY",
+     "Early recovery signal (+{trend_7d:.1f}% last 7d). Add position at discount before full rebound."),
+    ("BUY_MORE", 0.7, "MOMENTUM",
+     "Momentum building (+{trend_30d:.1f}% trend) with room to run. Add to winning position."),
+
+    # HOLD: Default for everything else
+    ("HOLD", 0.7, "LONG_HOLD",
+     "Solid gain ({roi:.1f}% ROI) with stable trends. Continue holding for further appreciation."),
+    ("HOLD", 0.5, "STEADY",
+     "Neutral position ({roi:.1f}% ROI). Watch for trend development before action."),
+    ("HOLD", 0.65, "MOMENTUM",
+     "Positive momentum (+{trend_30d:.1f}% over 30d). Hold for continued growth."),
+    ("HOLD", 0.6, "LONG_HOLD",
+     "Steady performance ({roi:.1f}% ROI). Hold and monitor for trend changes."),
+]
+
+
+def match_recommendation_rules(
+    purchase_price: np.ndarray,
+    roi: np.ndarray,
+    days_held: np.ndarray,
+    trend_7d: np.ndarray,
+    trend_30d: np.ndarray,
+    momentum: np.ndarray
+) -> np.ndarray:
+    """Index into RECOMMENDATION_RULES of the first rule each card matches."""
+    accelerating = momentum == "ACCELERATING"
+
+    conditions = [
+        purchase_price == 0,
+        (roi > 50) & (trend_30d < -5),
+        (roi > 30) & (days_held < 90) & (trend_7d < -10),
+        (roi < -30) & (trend_30d < -5),
+        (roi < -25) & accelerating & (trend_30d < 0),
+        (roi < -20) & (trend_30d > 5) & accelerating,
+        (roi < -10) & (trend_7d > 10) & (trend_30d > 0),
+        (roi > 20) & (roi < 40) & (trend_30d > 10) & accelerating,
+        (roi > 10) & (roi < 30),
+        (roi < 10) & (roi > -10),
+        trend_30d > 5,
+    ]
+
+    return np.select(conditions, np.arange(len(conditions)), default=len(conditions))
+
+
+def generate_recommendations(
+    cards: List[Dict[str, Any]],
+    all_metrics: List[Dict[str, Any]],
+    now: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    Generate buy/hold/sell recommendations for a batch of cards, evaluating
+    the rules over all cards at once.
+    """
+    if not cards:
+        return []
+
+    now = now or datetime.utcnow()
+
+    purchase_price = np.array(
+        [float(card.get("purchase_price") or card.get("purchasePrice") or 0) for card in cards]
+    )
+    estimated_value = np.array(
+        [float(card.get("estimated_value") or card.get("estimatedValue") or 0) for card in cards]
+    )
+    days_held = np.array([calculate_days_held(card, now) for card in cards])
+    trend_7d = np.array([m.get("trend_7d", 0) for m in all_metrics], dtype=np.float64)
+    trend_30d = np.array([m.get("trend_30d", 0) for m in all_metrics], dtype=np.float64)
+    momentum = np.array([m.get("momentum", "STEADY") for m in all_metrics])
+
+    # ROI is left at 0 where there is no purchase price (rule 0 catches those)
+    roi = np.divide(
+        estimated_value - purchase_price,
+        purchase_price,
+        out=np.zeros_like(purchase_price),
+        where=purchase_price != 0
+    ) * 100
+
+    matched = match_recommendation_rules(purchase_price, roi, days_held, trend_7d, trend_30d, momentum)
 
-    if roi > 30 and days_held < 90 and trend_7d < -10:
-        return {
-            "action": "SELL",
-            "confidence": 0.8,
-            "reasoning": f"Quick flip opportunity ({roi:.1f}% in {days_held} days) showing weakness. Exit before reversal.",
-            "category": "QUICK_FLIP",
-            "metrics": metrics
-        }
-
-    # CUT_LOSS Logic: Exit losing positions
-    if roi < -30 and trend_30d < -5:
-        return {
-            "action": "CUT_LOSS",
-            "confidence": 0.9,
-            "reasoning": f"Significant loss ({roi:.1f}%) with continuing downtrend. Cut losses to preserve capital.",
-            "category": "CUT_LOSS",
-            "metrics": metrics
-        }
-
-    if roi < -25 and momentum == "ACCELERATING" and trend_30d < 0:
-        return {
-            "action": "CUT_LOSS",
-            "confidence": 0.85,
-            "reasoning": f"Loss accelerating ({roi:.1f}% ROI, {momentum.lower()} momentum). Exit before further decline.",
-            "category": "CUT_LOSS",
-            "metrics": metrics
-        }
-
-    # BUY_MORE Logic: Average down or add to winners
-    if roi < -20 and trend_30d > 5 and momentum == "ACCELERATING":
-        return {
-            "action": "BUY_MORE",
-            "confidence": 0.8,
-            "reasoning": f"Strong recovery trend (+{trend_30d:.1f}% over 30d) after dip. Average down while momentum builds.",
-            "category": "RECOVERY",
-            "metrics": metrics
-        }
-
-    if roi < -10 and trend_7d > 10 and trend_30d > 0:
-        return {
-            "action": "BUY_MORE",
-            "confidence": 0.75,
-            "reasoning": f"Early recovery signal (+{trend_7d:.1f}% last 7d). Add position at discount before full rebound.",
-            "category": "RECOVERY",
-            "metrics": metrics
-        }
+    recommendations = []
+    for i, rule in enumerate(matched):
+        action, confidence, category, reasoning = RECOMMENDATION_RULES[rule]
+        recommendations.append({
+            "action": action,
+            "confidence": confidence,
+            "reasoning": reasoning.format(
+                roi=roi[i],
+                days_held=days_held[i],
+                trend_7d=trend_7d[i],
+                trend_30d=trend_30d[i],
+                momentum=momentum[i].lower()
+            ),
+            "category": category,
+            "metrics": all_metrics[i]
+        })
 
-    if roi > 20 and roi < 40 and trend_30d > 10 and momentum == "ACCELERATING":
-        return {
-            "action": "BUY_MORE",
-            "confidence": 0.7,
-            "reasoning": f"Momentum building (+{trend_30d:.1f}% trend) with room to run. Add to winning position.",
-            "category": "MOMENTUM",
-            "metrics": metrics
-        }
+    return recommendations
 
-    # HOLD Logic: Default for everything else
-    category = "LONG_HOLD"
-    confidence = 0.6
-    reasoning = f"Steady performance ({roi:.1f}% ROI). Hold and monitor for trend changes."
-
-    if roi > 10 and roi < 30:
-        category = "LONG_HOLD"
-        confidence = 0.7
-        reasoning = f"Solid gain ({roi:.1f}% ROI) with stable trends. Continue holding for further appreciation."
-    elif roi < 10 and roi > -10:
-        category = "STEADY"
-        confidence = 0.5
-        reasoning = f"Neutral position ({roi:.1f}% ROI). Watch for trend development before action."
-    elif trend_30d > 5:
-        category = "MOMENTUM"
-        confidence = 0.65
-        reasoning = f"Positive momentum (+{trend_30d:.1f}% over 30d). Hold for continued growth."
 
-    return {
-        "action": "HOLD",
-        "confidence": confidence,
-        "reasoning": reasoning,
-        "category": category,
-        "metrics": metrics
-    }
+def generate_recommendation(
+    card: Dict[str, Any],
+    metrics: Dict[str, Any],
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Generate buy/hold/sell recommendation based on trends and metrics."""
+    return generate_recommendations([card], [metrics], now)[0]
 
 
 # ============================================================================
@@ -244,20 +294,16 @@ def generate_recommendation(card: Dict[str, Any], metrics: Dict[str, Any]) -> Di
 async def get_card_recommendation(card_id: str, user = Depends(get_current_user)):
     """Get AI recommendation for a specific card."""
 
-    # Get card
-    card = get_card_by_id(card_id)
+    # Get card (ownership is enforced by the query)
+    card = await run_in_threadpool(get_user_card, card_id, user["id"])
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
 
-    # Verify ownership
-    if card.get("user_id") != user["id"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Get price history
-    price_history = get_market_price_history(card_id, limit=365)
-
-    # Analyze trends
-    metrics = analyze_card_trends(card, price_history)
+    # Analyze trends (cached until the card gets a new price)
+    latest_price = await run_in_threadpool(get_latest_market_price, card_id)
+    latest_checked = latest_price["checked_at"] if latest_price else None
+    all_metrics = await run_in_threadpool(get_trend_metrics, [card], [latest_checked])
+    metrics = all_metrics[0]
 
     # Generate recommendation
     recommendation = generate_recommendation(card, metrics)
@@ -270,7 +316,7 @@ async def get_portfolio_recommendations(user = Depends(get_current_user)):
     """Get AI recommendations for entire portfolio."""
 
     # Get all user cards
-    result = get_user_cards(user["id"], page=1, per_page=1000)
+    result = await run_in_threadpool(get_user_cards, user["id"], page=1, per_page=1000)
     cards = result.get("cards", [])
 
     recommendations = []
@@ -281,16 +327,17 @@ async def get_portfolio_recommendations(user = Depends(get_current_user)):
         "cutLoss": 0
     }
 
-    for card in cards:
-        # Get price history
-        price_history = get_market_price_history(card["id"], limit=365)
-
-        # Analyze trends
-        metrics = analyze_card_trends(card, price_history)
+    # Analyze trends; the listing already carries each card's latest price
+    all_metrics = await run_in_threadpool(
+        get_trend_metrics,
+        cards,
+        [card["marketValue"]["lastChecked"] if card.get("marketValue") else None for card in cards]
+    )
 
-        # Generate recommendation
-        rec = generate_recommendation(card, metrics)
+    # Generate recommendations for the whole portfolio at once
+    all_recs = generate_recommendations(cards, all_metrics)
 
+    for card, rec in zip(cards, all_recs):
         # Add card info to recommendation
         recommendations.append({
             "cardId": card["id"],
@@ -3,48 +3,61 @@
 import sys
 from pathlib import Path
 import openpyxl
-from db.models import init_db, upsert_player
+from db.models import init_db, upsert_players_bulk
+
+IMPORT_BATCH_SIZE = 500
 
 
 def import_spreadsheet(xlsx_path):
-    wb = openpyxl.load_workbook(xlsx_path)
-    ws = wb.active
+    # Read-only mode streams rows instead of loading the whole workbook
+    wb = openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+
+        current_draft_year = None
+        imported = 0
+        batch = []
+
+        for row in ws.iter_rows(min_row=1, values_only=True):
+            first_cell = row[0] if row else None
 
-    current_draft_year = None
-    imported = 0
+            if first_cell is None or str(first_cell).strip() == "":
+                # Check if the second column (index 1) has a header or is empty
+                continue
 
-    for row in ws.iter_rows(min_row=1, values_only=True):
-        first_cell = row[0]
+            val = str(first_cell).strip()
 
-        if first_cell is None or str(first_cell).strip() == "":
-            # Check if the second column (index 1) has a header or is empty
-            continue
+            # Check if this row is a year header
+            if val.isdigit() and 2025 <= int(val) <= 2035:
+                current_draft_year = int(val)
+                print(f"\n--- Draft Class {current_draft_year} ---")
+                continue
 
-        val = str(first_cell).strip()
+            # Skip header row
+            if val.lower() in ("name", "player", ""):
+                continue
 
-        # Check if this row is a year header
-        if val.isdigit() and 2025 <= int(val) <= 2035:
-            current_draft_year = int(val)
-            print(f"\n--- Draft Class {current_draft_year} ---")
-            continue
+            if current_draft_year is None:
+                continue
 
-        # Skip header row
-        if val.lower() in ("name", "player", ""):
-            continue
+            # This is a player row
+            name = val
+            # Column B (index 1) is blank, Column C (index 2) is College
+            school = None
+            if len(row) > 2 and row[2] is not None:
+                school = str(row[2]).strip() or None
 
-        if current_draft_year is None:
-            continue
+            batch.append({"name": name, "draft_year": current_draft_year, "school": school})
+            print(f"  Imported: {name} (class of {current_draft_year})")
+            imported += 1
 
-        # This is a player row
-        name = val
-        # Column B (index 1) is blank, Column C (index 2) is College
-        school = None
-        if len(row) > 2 and row[2] is not None:
-            school = str(row[2]).strip() or None
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                upsert_players_bulk(batch)
+                batch.clear()
 
-        player_id = upsert_player(name, current_draft_year, school=school)
-        print(f"  Imported: {name} (class of {current_draft_year})")
-        imported += 1
+        upsert_players_bulk(batch)
+    finally:
+        wb.close()
 
     print(f"\nTotal imported: {imported} players")
     return imported
@@ -3,25 +3,246 @@
 Supports multiple sports: WNBA, NBA, NFL, NHL, MLB
 """
 
+import atexit
+import json
 import sqlite3
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 DB_PATH = Path(__file__).parent.parent / "data" / "prospects.db"
 
+# Size of sqlite3's per-connection prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Minimum time between full ANALYZE runs (see maybe_analyze)
+ANALYZE_INTERVAL = timedelta(days=1)
+
+# Statements run in scrape loops, shared by the single-row and bulk writers.
+# A NULL date parameter means today (local time), filled in by SQLite.
+SQL_UPSERT_PLAYER = """
+    INSERT INTO players (name, draft_year, sport, school, position, height, hometown)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, draft_year, sport) DO UPDATE SET
+      school = COALESCE(excluded.school, school),
+      position = COALESCE(excluded.position, position),
+      height = COALESCE(excluded.height, height),
+      hometown = COALESCE(excluded.hometown, hometown),
+      updated_at = datetime('now')
+"""
+SQL_UPSERT_PLAYER_RETURNING = SQL_UPSERT_PLAYER + "    RETURNING id\n"
+SQL_UPSERT_RANKING = """
+    INSERT INTO rankings
+    (player_id, source, rank, projected_pick,
+     projected_round, scrape_date, url, raw_text)
+    VALUES (?, ?, ?, ?, ?, COALESCE(?, date('now', 'localtime')), ?, ?)
+    ON CONFLICT(player_id, source, scrape_date) DO UPDATE SET
+      rank = excluded.rank,
+      projected_pick = excluded.projected_pick,
+      projected_round = excluded.projected_round,
+      url = excluded.url,
+      raw_text = excluded.raw_text
+"""
+SQL_UPSERT_CARD_VALUE = """
+    INSERT INTO card_values
+    (player_id, card_type, value_dollars, recorded_date, notes,
+     source, listing_count, lowest_bin, avg_price, ebay_search_url)
+    VALUES (?, ?, ?, COALESCE(?, date('now', 'localtime')), ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(player_id, card_type, source, recorded_date) DO UPDATE SET
+      value_dollars = excluded.value_dollars,
+      listing_count = excluded.listing_count,
+      lowest_bin = excluded.lowest_bin,
+      avg_price = excluded.avg_price,
+      ebay_search_url = excluded.ebay_search_url,
+      notes = excluded.notes
+"""
+SQL_UPSERT_WATCHLIST_PRICE = """
+    INSERT INTO watchlist_prices
+    (watchlist_id, card_type, lowest_bin, avg_price, listing_count,
+     ebay_search_url, recorded_date)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, date('now', 'localtime')))
+    ON CONFLICT(watchlist_id, card_type, recorded_date) DO UPDATE SET
+      lowest_bin = excluded.lowest_bin,
+      avg_price = excluded.avg_price,
+      listing_count = excluded.listing_count,
+      ebay_search_url = excluded.ebay_search_url
+"""
+SQL_INSERT_PORTFOLIO_PRICE = """
+    INSERT INTO portfolio_price_history
+    (portfolio_card_id, price, source, sale_type, title,
+     match_confidence, recorded_date)
+    VALUES (?, ?, ?, ?, ?, ?, COALESCE(?, date('now', 'localtime')))
+"""
+SQL_UPSERT_PLAYER_STATS = """
+    INSERT INTO player_stats
+    (player_id, season, stat_type, game_date, opponent, games_played,
+     points_per_game, rebounds_per_game, assists_per_game,
+     steals_per_game, blocks_per_game, fg_pct, three_pct, ft_pct,
+     minutes_per_game, source_url, scraped_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, date('now', 'localtime')))
+    ON CONFLICT(player_id, season, stat_type, game_date) DO UPDATE SET
+      games_played = excluded.games_played,
+      points_per_game = excluded.points_per_game,
+      rebounds_per_game = excluded.rebounds_per_game,
+      assists_per_game = excluded.assists_per_game,
+      steals_per_game = excluded.steals_per_game,
+      blocks_per_game = excluded.blocks_per_game,
+      fg_pct = excluded.fg_pct,
+      three_pct = excluded.three_pct,
+      ft_pct = excluded.ft_pct,
+      minutes_per_game = excluded.minutes_per_game,
+      source_url = excluded.source_url,
+      scraped_date = excluded.scraped_date
+"""
+SQL_INSERT_PLAYER_STATUS = """
+    INSERT INTO player_status_log (player_id, status, reason, detected_date)
+    VALUES (?, ?, ?, COALESCE(?, date('now', 'localtime')))
+"""
+SQL_INSERT_SCRAPE_LOG = """
+    INSERT INTO scrape_log (source, url, draft_year, status, players_found, error_message)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
-def get_connection():
+# One connection per thread, opened on first use and kept for the process
+_conn_local = threading.local()
+
+# db.models writes go through one connection, one transaction at a time, so
+# they never contend with each other for SQLite's write lock
+_writer_lock = threading.Lock()
+_writer_conn = None
+
+
+class _SharedConnection(sqlite3.Connection):
+    """Connection shared by every get_connection() call in a thread.
+
+    close() only rolls back an uncommitted transaction (what closing used to
+    do), so callers that still close their connection don't close it for
+    everyone else. close_connection() really closes it.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def _close(self):
+        super().close()
+
+
+def _open_connection(**kwargs):
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    # timeout doubles as the busy timeout when another process holds the lock
+    conn = sqlite3.connect(str(DB_PATH), timeout=5.0,
+                           cached_statements=STATEMENT_CACHE_SIZE, **kwargs)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
+    # In WAL mode NORMAL only fsyncs at checkpoints and stays corruption-safe
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Don't stall a bulk scrape on a checkpoint every 1000 pages; callers
+    # run checkpoint_wal() when the batch is done instead
+    conn.execute("PRAGMA wal_autocheckpoint=10000")
+    conn.execute("PRAGMA journal_size_limit=67108864")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
     conn.execute("PRAGMA foreign_keys=ON")
     return conn
 
 
+def get_connection():
+    conn = getattr(_conn_local, "conn", None)
+    if conn is None:
+        conn = _conn_local.conn = _open_connection(factory=_SharedConnection)
+    return conn
+
+
+def _get_writer():
+    # Caller holds _writer_lock
+    global _writer_conn
+    if _writer_conn is None:
+        _writer_conn = _open_connection(check_same_thread=False)
+    return _writer_conn
+
+
+@contextmanager
+def write_connection():
+    """Run a write transaction on the writer connection.
+
+    Holds the writer lock for the whole transaction; commits on success and
+    rolls back if the block raises.
+    """
+    with _writer_lock:
+        conn = _get_writer()
+        with conn:
+            yield conn
+
+
+def _optimize(conn):
+    # Lets SQLite re-ANALYZE tables whose stats this connection's queries
+    # would benefit from; a busy database just skips it until next time
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+
+
+def close_connection():
+    """Close this thread's connection and the writer; both reopen on next use."""
+    global _writer_conn
+    conn = getattr(_conn_local, "conn", None)
+    if conn is not None:
+        _conn_local.conn = None
+        _optimize(conn)
+        conn._close()
+    with _writer_lock:
+        if _writer_conn is not None:
+            _optimize(_writer_conn)
+            _writer_conn.close()
+            _writer_conn = None
+
+
+atexit.register(close_connection)
+
+
+@lru_cache(maxsize=None)
+def _record_type(columns):
+    return namedtuple("Record", columns, rename=True)
+
+
+def _iter_records(conn, sql, params=()):
+    """Run a query and yield its rows as namedtuples.
+
+    Rows come back as plain tuples and are wrapped in one class per column
+    list, built once and reused: attribute access, no per-row dict, and
+    they feed straight into DataFrame.from_records.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    record = _record_type(tuple(d[0] for d in cursor.description))
+    return map(record._make, cursor)
+
+
+def _fetch_tuples(conn, sql, params=()):
+    """Run a query and return its rows as plain tuples.
+
+    For small positional reads where a sqlite3.Row per row buys nothing.
+    The row factory is set on the cursor only; the shared connection's
+    stays sqlite3.Row.
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(sql, params).fetchall()
+
+
 def init_db():
     conn = get_connection()
+    # One transaction for the whole script instead of an autocommit per CREATE
     conn.executescript("""
+        BEGIN;
+
         CREATE TABLE IF NOT EXISTS players (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
@@ -185,62 +406,123 @@ def init_db():
             created_at TEXT DEFAULT (datetime('now'))
         );
 
-        CREATE INDEX IF NOT EXISTS idx_rankings_player ON rankings(player_id);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+
         CREATE INDEX IF NOT EXISTS idx_rankings_source_date ON rankings(source, scrape_date);
         CREATE INDEX IF NOT EXISTS idx_players_draft_year ON players(draft_year);
-        CREATE INDEX IF NOT EXISTS idx_portfolio_price_card ON portfolio_price_history(portfolio_card_id);
         CREATE INDEX IF NOT EXISTS idx_portfolio_price_date ON portfolio_price_history(recorded_date);
         CREATE INDEX IF NOT EXISTS idx_title_map_player ON card_title_mappings(player_name);
         CREATE INDEX IF NOT EXISTS idx_player_stats_player ON player_stats(player_id);
         CREATE INDEX IF NOT EXISTS idx_portfolio_cards_status ON portfolio_cards(status);
+
+        COMMIT;
     """)
-    # Add user_email column if it doesn't exist (migration for existing DBs)
-    try:
-        conn.execute("ALTER TABLE portfolio_cards ADD COLUMN user_email TEXT")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    # Create index on user_email
-    try:
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_cards_user ON portfolio_cards(user_email)")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass
-    # Add photo_url, country, tier columns for player dashboard (migration)
-    for col in ["photo_url TEXT", "country TEXT", "tier TEXT"]:
-        try:
-            conn.execute(f"ALTER TABLE players ADD COLUMN {col}")
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
-
-    # Add sport column for multi-sport support (migration)
-    try:
-        conn.execute("ALTER TABLE players ADD COLUMN sport TEXT DEFAULT 'WNBA'")
-        conn.commit()
-        # Set existing players to WNBA
-        conn.execute("UPDATE players SET sport = 'WNBA' WHERE sport IS NULL")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
-    # Create index on sport for efficient filtering
-    try:
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_players_sport ON players(sport)")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass
 
-    # Create unique index for (name, draft_year, sport) - replaces old (name, draft_year) constraint
-    # Note: SQLite doesn't support dropping constraints, so we create a new unique index instead
-    try:
-        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_players_name_year_sport ON players(name, draft_year, sport)")
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Index already exists
+    # Bring the schema up to date; each migration runs once per database
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version < len(SCHEMA_MIGRATIONS):
+        with conn:
+            # sqlite3 only opens a transaction by itself before DML; begin
+            # explicitly so every pending migration and the version bump
+            # commit (or roll back) together
+            conn.execute("BEGIN")
+            for migrate in SCHEMA_MIGRATIONS[version:]:
+                migrate(conn)
+            conn.execute(f"PRAGMA user_version = {len(SCHEMA_MIGRATIONS)}")
+
+
+def _add_column(conn, table, column):
+    """ALTER TABLE ... ADD COLUMN, unless the column is already there.
+
+    Databases created before user_version was tracked already have some of
+    the migrated columns while still at version 0.
+    """
+    name = column.split()[0]
+    if name not in {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+
 
-    conn.commit()
-    conn.close()
+def _migrate_player_dashboard(conn):
+    # photo_url, country, tier columns for the player dashboard
+    for column in ["photo_url TEXT", "country TEXT", "tier TEXT"]:
+        _add_column(conn, "players", column)
+
+
+def _migrate_multi_sport(conn):
+    # sport column for multi-sport support; existing players are WNBA
+    _add_column(conn, "players", "sport TEXT DEFAULT 'WNBA'")
+    conn.execute("UPDATE players SET sport = 'WNBA' WHERE sport IS NULL")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_sport ON players(sport)")
+    # Unique (name, draft_year, sport) replaces the old (name, draft_year)
+    # constraint; SQLite can't drop constraints, so it's a unique index
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_players_name_year_sport ON players(name, draft_year, sport)")
+
+
+def _migrate_portfolio_users(conn):
+    # Per-user portfolios
+    _add_column(conn, "portfolio_cards", "user_email TEXT")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_portfolio_cards_user ON portfolio_cards(user_email)")
+
+
+def _migrate_latest_row_indexes(conn):
+    # Serve "latest row per key" lookups from the index: partition key,
+    # then date. rankings is already covered by its
+    # UNIQUE(player_id, source, scrape_date) index.
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cv_player_source_date ON card_values(player_id, source, recorded_date DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_pph_card_date ON portfolio_price_history(portfolio_card_id, recorded_date DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_wp_watchlist_date ON watchlist_prices(watchlist_id, recorded_date DESC)")
+    # Prefixes of the indexes above (or of the rankings unique index)
+    conn.execute("DROP INDEX IF EXISTS idx_rankings_player")
+    conn.execute("DROP INDEX IF EXISTS idx_portfolio_price_card")
+
+
+def _migrate_sport_draft_year_index(conn):
+    # Dashboard (draft_year + sport) and per-sport year/count lookups;
+    # idx_players_sport is a prefix of it
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_players_sport_draftyear ON players(sport, draft_year)")
+    conn.execute("DROP INDEX IF EXISTS idx_players_sport")
+
+
+# Schema migrations in order; PRAGMA user_version is the number applied
+SCHEMA_MIGRATIONS = [
+    _migrate_player_dashboard,
+    _migrate_multi_sport,
+    _migrate_portfolio_users,
+    _migrate_latest_row_indexes,
+    _migrate_sport_draft_year_index,
+]
+
+
+def checkpoint_wal():
+    """Copy the WAL back into the database and truncate it.
+
+    Call after bulk scrapes and imports to keep the WAL file small.
+    """
+    with _writer_lock:
+        _get_writer().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def maybe_analyze():
+    """Run a full ANALYZE if the last one was more than ANALYZE_INTERVAL ago.
+
+    Call after bulk scrapes and imports, which change table sizes the most.
+    Returns True if ANALYZE ran.
+    """
+    now = datetime.now()
+    with write_connection() as conn:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'last_analyze'").fetchone()
+        if row and now - datetime.fromisoformat(row[0]) < ANALYZE_INTERVAL:
+            return False
+        conn.execute("ANALYZE")
+        conn.execute(
+            """INSERT INTO meta (key, value) VALUES ('last_analyze', ?)
+               ON CONFLICT(key) DO UPDATE SET value = excluded.value""",
+            (now.isoformat(),),
+        )
+    return True
 
 
 def upsert_player(name, draft_year, sport='WNBA', school=None, position=None, height=None, hometown=None):
@@ -258,181 +540,194 @@ def upsert_player(name, draft_year, sport='WNBA', school=None, position=None, he
     from db.normalize import normalize_name
     name = normalize_name(name)
     sport = sport.upper() if sport else 'WNBA'
-    conn = get_connection()
+    with write_connection() as conn:
+        # Insert, or fill in the details of the existing (name, draft_year,
+        # sport) player; either way the row's id comes back
+        player_id = conn.execute(
+            SQL_UPSERT_PLAYER_RETURNING,
+            (name, draft_year, sport, school, position, height, hometown),
+        ).fetchone()[0]
 
-    # First try to find existing player by name, year, and sport
-    existing = conn.execute(
-        "SELECT id FROM players WHERE name = ? AND draft_year = ? AND sport = ?",
-        (name.strip(), draft_year, sport)
-    ).fetchone()
+    return player_id
 
-    if existing:
-        # Update existing player
-        conn.execute(
-            """UPDATE players SET
-                 school = COALESCE(?, school),
-                 position = COALESCE(?, position),
-                 height = COALESCE(?, height),
-                 hometown = COALESCE(?, hometown),
-                 updated_at = datetime('now')
-               WHERE id = ?""",
-            (school, position, height, hometown, existing[0])
+
+def upsert_players_bulk(players):
+    """Insert or update many players in one transaction. Returns the row count.
+
+    Each player is a dict with name and draft_year, plus optional sport,
+    school, position, height and hometown (same semantics as upsert_player:
+    missing fields never overwrite existing values).
+    """
+    from db.normalize import normalize_names_bulk
+    names = normalize_names_bulk([p["name"] for p in players])
+    rows = [
+        (
+            name,
+            p["draft_year"],
+            p["sport"].upper() if p.get("sport") else 'WNBA',
+            p.get("school"),
+            p.get("position"),
+            p.get("height"),
+            p.get("hometown"),
         )
-        player_id = existing[0]
-    else:
-        # Insert new player
-        cursor = conn.execute(
-            """INSERT INTO players (name, draft_year, sport, school, position, height, hometown)
-               VALUES (?, ?, ?, ?, ?, ?, ?)
-               RETURNING id""",
-            (name.strip(), draft_year, sport, school, position, height, hometown),
+        for p, name in zip(players, names)
+    ]
+    if not rows:
+        return 0
+
+    with write_connection() as conn:
+        conn.executemany(
+            SQL_UPSERT_PLAYER,
+            rows,
         )
-        player_id = cursor.fetchone()[0]
-
-    conn.commit()
-    conn.close()
-    return player_id
+    return len(rows)
 
 
 def add_ranking(player_id, source, rank=None, projected_pick=None,
                 projected_round=None, url=None, raw_text=None, scrape_date=None):
-    if scrape_date is None:
-        scrape_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO rankings (player_id, source, rank, projected_pick,
-           projected_round, scrape_date, url, raw_text)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(player_id, source, scrape_date) DO UPDATE SET
-             rank = excluded.rank,
-             projected_pick = excluded.projected_pick,
-             projected_round = excluded.projected_round,
-             url = excluded.url,
-             raw_text = excluded.raw_text""",
-        (player_id, source, rank, projected_pick, projected_round,
-         scrape_date, url, raw_text),
-    )
-    conn.commit()
-    conn.close()
+    add_rankings_bulk([{
+        "player_id": player_id, "source": source, "rank": rank,
+        "projected_pick": projected_pick, "projected_round": projected_round,
+        "url": url, "raw_text": raw_text, "scrape_date": scrape_date,
+    }])
+
+
+def add_rankings_bulk(rankings):
+    """Insert or update many rankings in one transaction. Returns the row count.
+
+    Each ranking is a dict of add_ranking's arguments (player_id and source
+    required); scrape_date defaults to today.
+    """
+    rows = [
+        (r["player_id"], r["source"], r.get("rank"), r.get("projected_pick"),
+         r.get("projected_round"), r.get("scrape_date"),
+         r.get("url"), r.get("raw_text"))
+        for r in rankings
+    ]
+    if not rows:
+        return 0
+
+    with write_connection() as conn:
+        conn.executemany(
+            SQL_UPSERT_RANKING,
+            rows,
+        )
+    return len(rows)
 
 
 def add_card_value(player_id, value_dollars=None, card_type="autograph", notes=None,
                    recorded_date=None, source="manual", listing_count=None,
                    lowest_bin=None, avg_price=None, ebay_search_url=None):
-    if recorded_date is None:
-        recorded_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO card_values
-           (player_id, card_type, value_dollars, recorded_date, notes,
-            source, listing_count, lowest_bin, avg_price, ebay_search_url)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(player_id, card_type, source, recorded_date) DO UPDATE SET
-             value_dollars = excluded.value_dollars,
-             listing_count = excluded.listing_count,
-             lowest_bin = excluded.lowest_bin,
-             avg_price = excluded.avg_price,
-             ebay_search_url = excluded.ebay_search_url,
-             notes = excluded.notes""",
-        (player_id, card_type, value_dollars, recorded_date, notes,
-         source, listing_count, lowest_bin, avg_price, ebay_search_url),
-    )
-    conn.commit()
-    conn.close()
+    add_card_values_bulk([{
+        "player_id": player_id, "value_dollars": value_dollars,
+        "card_type": card_type, "notes": notes, "recorded_date": recorded_date,
+        "source": source, "listing_count": listing_count, "lowest_bin": lowest_bin,
+        "avg_price": avg_price, "ebay_search_url": ebay_search_url,
+    }])
 
 
-def get_latest_card_values(draft_year=None):
-    """Get most recent card values for all players."""
+def add_card_values_bulk(values):
+    """Insert or update many card values in one transaction. Returns the row count.
+
+    Each value is a dict of add_card_value's arguments (player_id required,
+    same defaults); recorded_date defaults to today.
+    """
+    rows = [
+        (v["player_id"], v.get("card_type", "autograph"), v.get("value_dollars"),
+         v.get("recorded_date"), v.get("notes"), v.get("source", "manual"),
+         v.get("listing_count"), v.get("lowest_bin"), v.get("avg_price"),
+         v.get("ebay_search_url"))
+        for v in values
+    ]
+    if not rows:
+        return 0
+
+    with write_connection() as conn:
+        conn.executemany(
+            SQL_UPSERT_CARD_VALUE,
+            rows,
+        )
+    return len(rows)
+
+
+def iter_latest_card_values(draft_year=None):
+    """Yield the most recent card values for all players, one dict at a time."""
     conn = get_connection()
     query = """
         SELECT p.id, p.name, p.draft_year, p.school, p.position,
                cv.lowest_bin, cv.avg_price, cv.listing_count,
                cv.ebay_search_url, cv.recorded_date, cv.card_type
         FROM players p
-        LEFT JOIN card_values cv ON p.id = cv.player_id
-            AND cv.source = 'ebay'
-            AND cv.recorded_date = (
-                SELECT MAX(cv2.recorded_date) FROM card_values cv2
-                WHERE cv2.player_id = cv.player_id AND cv2.source = 'ebay'
-            )
+        LEFT JOIN (
+            SELECT *, RANK() OVER (
+                PARTITION BY player_id ORDER BY recorded_date DESC
+            ) AS _rank
+            FROM card_values
+            WHERE source = 'ebay'
+        ) cv ON p.id = cv.player_id AND cv._rank = 1
     """
     params = []
     if draft_year:
         query += " WHERE p.draft_year = ?"
         params.append(draft_year)
     query += " ORDER BY p.draft_year, cv.lowest_bin ASC NULLS LAST, p.name"
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    for row in conn.execute(query, params):
+        yield dict(row)
+
+
+def get_latest_card_values(draft_year=None):
+    """Get most recent card values for all players."""
+    return list(iter_latest_card_values(draft_year))
 
 
 def get_card_price_history(player_id):
     """Get card price history for a player."""
     conn = get_connection()
-    rows = conn.execute("""
+    return conn.execute("""
         SELECT recorded_date, lowest_bin, avg_price, listing_count, source
         FROM card_values
         WHERE player_id = ? AND source = 'ebay'
         ORDER BY recorded_date
     """, (player_id,)).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
 
 
 def add_watchlist_player(name, sport=None, notes=None):
-    conn = get_connection()
-    cursor = conn.execute(
-        """INSERT INTO watchlist (name, sport, notes) VALUES (?, ?, ?)
-           ON CONFLICT(name) DO UPDATE SET
-             sport = COALESCE(excluded.sport, sport),
-             notes = COALESCE(excluded.notes, notes)
-           RETURNING id""",
-        (name.strip(), sport, notes),
-    )
-    wid = cursor.fetchone()[0]
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        cursor = conn.execute(
+            """INSERT INTO watchlist (name, sport, notes) VALUES (?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET
+                 sport = COALESCE(excluded.sport, sport),
+                 notes = COALESCE(excluded.notes, notes)
+               RETURNING id""",
+            (name.strip(), sport, notes),
+        )
+        wid = cursor.fetchone()[0]
     return wid
 
 
 def remove_watchlist_player(name):
-    conn = get_connection()
-    row = conn.execute("SELECT id FROM watchlist WHERE name = ?", (name.strip(),)).fetchone()
-    if row:
-        conn.execute("DELETE FROM watchlist_prices WHERE watchlist_id = ?", (row[0],))
-        conn.execute("DELETE FROM watchlist WHERE id = ?", (row[0],))
-        conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        row = conn.execute("SELECT id FROM watchlist WHERE name = ?", (name.strip(),)).fetchone()
+        if row:
+            conn.execute("DELETE FROM watchlist_prices WHERE watchlist_id = ?", (row[0],))
+            conn.execute("DELETE FROM watchlist WHERE id = ?", (row[0],))
     return row is not None
 
 
 def get_watchlist():
     conn = get_connection()
     rows = conn.execute("SELECT * FROM watchlist ORDER BY name").fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
 def add_watchlist_price(watchlist_id, lowest_bin, avg_price, listing_count,
                         ebay_search_url, card_type="autograph", recorded_date=None):
-    if recorded_date is None:
-        recorded_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO watchlist_prices
-           (watchlist_id, card_type, lowest_bin, avg_price, listing_count,
-            ebay_search_url, recorded_date)
-           VALUES (?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(watchlist_id, card_type, recorded_date) DO UPDATE SET
-             lowest_bin = excluded.lowest_bin,
-             avg_price = excluded.avg_price,
-             listing_count = excluded.listing_count,
-             ebay_search_url = excluded.ebay_search_url""",
-        (watchlist_id, card_type, lowest_bin, avg_price, listing_count,
-         ebay_search_url, recorded_date),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            SQL_UPSERT_WATCHLIST_PRICE,
+            (watchlist_id, card_type, lowest_bin, avg_price, listing_count,
+             ebay_search_url, recorded_date),
+        )
 
 
 def get_watchlist_with_prices():
@@ -442,26 +737,44 @@ def get_watchlist_with_prices():
                wp.lowest_bin, wp.avg_price, wp.listing_count,
                wp.ebay_search_url, wp.recorded_date
         FROM watchlist w
-        LEFT JOIN watchlist_prices wp ON w.id = wp.watchlist_id
-            AND wp.recorded_date = (
-                SELECT MAX(wp2.recorded_date) FROM watchlist_prices wp2
-                WHERE wp2.watchlist_id = wp.id
-            )
+        LEFT JOIN (
+            SELECT *, RANK() OVER (
+                PARTITION BY watchlist_id ORDER BY recorded_date DESC
+            ) AS _rank
+            FROM watchlist_prices
+        ) wp ON w.id = wp.watchlist_id AND wp._rank = 1
         ORDER BY w.name
     """).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
 def log_scrape(source, url, draft_year, status, players_found=0, error_message=None):
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO scrape_log (source, url, draft_year, status, players_found, error_message)
-           VALUES (?, ?, ?, ?, ?, ?)""",
-        (source, url, draft_year, status, players_found, error_message),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            SQL_INSERT_SCRAPE_LOG,
+            (source, url, draft_year, status, players_found, error_message),
+        )
+
+
+class ScrapeLogger:
+    """Collect scrape_log entries and write them in one transaction on exit.
+
+    log() takes the same arguments as log_scrape(). Entries are flushed
+    even if the block raises, so failed runs still leave their log.
+    """
+
+    def __enter__(self):
+        self.rows = []
+        return self
+
+    def log(self, source, url, draft_year, status, players_found=0, error_message=None):
+        self.rows.append((source, url, draft_year, status, players_found, error_message))
+
+    def __exit__(self, *exc_info):
+        if self.rows:
+            with write_connection() as conn:
+                conn.executemany(SQL_INSERT_SCRAPE_LOG, self.rows)
+            self.rows = []
 
 
 def get_players_by_draft_year(draft_year, sport=None):
@@ -476,24 +789,37 @@ def get_players_by_draft_year(draft_year, sport=None):
         rows = conn.execute(
             "SELECT * FROM players WHERE draft_year = ? ORDER BY name", (draft_year,)
         ).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
 def get_latest_rankings(player_id):
+    return get_latest_rankings_bulk([player_id]).get(player_id, [])
+
+
+def get_latest_rankings_bulk(player_ids):
+    """Latest ranking from each source for many players in one query.
+
+    Returns {player_id: [rows ordered by source]}; players without
+    rankings are left out.
+    """
     conn = get_connection()
     rows = conn.execute(
-        """SELECT source, rank, projected_pick, projected_round, scrape_date
-           FROM rankings WHERE player_id = ?
-           AND scrape_date = (
-               SELECT MAX(scrape_date) FROM rankings r2
-               WHERE r2.player_id = rankings.player_id AND r2.source = rankings.source
+        """SELECT player_id, source, rank, projected_pick, projected_round, scrape_date
+           FROM (
+               SELECT *, ROW_NUMBER() OVER (
+                   PARTITION BY player_id, source ORDER BY scrape_date DESC
+               ) AS _rn
+               FROM rankings
+               WHERE player_id IN (SELECT value FROM json_each(?))
            )
-           ORDER BY source""",
-        (player_id,),
-    ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+           WHERE _rn = 1
+           ORDER BY player_id, source""",
+        (json.dumps(list(player_ids)),),
+    )
+    latest = {}
+    for row in rows:
+        latest.setdefault(row["player_id"], []).append(row)
+    return latest
 
 
 def get_ranking_history(player_id, source=None):
@@ -505,26 +831,27 @@ def get_ranking_history(player_id, source=None):
         query += " AND source = ?"
         params.append(source)
     query += " ORDER BY scrape_date"
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    return conn.execute(query, params).fetchall()
 
 
-def get_all_players_with_rankings():
+def iter_all_players_with_rankings():
     conn = get_connection()
-    rows = conn.execute("""
+    yield from _iter_records(conn, """
         SELECT p.id, p.name, p.draft_year, p.school, p.position,
                r.source, r.rank, r.projected_pick, r.scrape_date
         FROM players p
-        LEFT JOIN rankings r ON p.id = r.player_id
-            AND r.scrape_date = (
-                SELECT MAX(r2.scrape_date) FROM rankings r2
-                WHERE r2.player_id = r.player_id AND r2.source = r.source
-            )
+        LEFT JOIN (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY player_id, source ORDER BY scrape_date DESC
+            ) AS _rn
+            FROM rankings
+        ) r ON p.id = r.player_id AND r._rn = 1
         ORDER BY p.draft_year, p.name, r.source
-    """).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    """)
+
+
+def get_all_players_with_rankings():
+    return list(iter_all_players_with_rankings())
 
 
 # --- Portfolio CRUD ---
@@ -535,26 +862,25 @@ def add_portfolio_card(player_name, card_year, manufacturer, set_name,
                        is_rookie=0, grade="Raw", purchase_price=None,
                        purchase_date=None, notes=None, player_id=None,
                        user_email=None):
+    """Add a card to the portfolio. Returns the new row as a dict."""
     if purchase_date is None:
         purchase_date = date.today().isoformat()
-    conn = get_connection()
-    cursor = conn.execute(
-        """INSERT INTO portfolio_cards
-           (player_id, player_name, card_year, manufacturer, set_name,
-            card_number, parallel, is_numbered, numbered_to, serial_number,
-            is_autograph, is_rookie, grade, purchase_price, purchase_date, notes,
-            user_email)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-           RETURNING id""",
-        (player_id, player_name.strip(), card_year, manufacturer.strip(),
-         set_name.strip(), card_number, parallel or "Base", is_numbered,
-         numbered_to, serial_number, is_autograph, is_rookie,
-         grade or "Raw", purchase_price, purchase_date, notes, user_email),
-    )
-    card_id = cursor.fetchone()[0]
-    conn.commit()
-    conn.close()
-    return card_id
+    with write_connection() as conn:
+        cursor = conn.execute(
+            """INSERT INTO portfolio_cards
+               (player_id, player_name, card_year, manufacturer, set_name,
+                card_number, parallel, is_numbered, numbered_to, serial_number,
+                is_autograph, is_rookie, grade, purchase_price, purchase_date, notes,
+                user_email)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               RETURNING *""",
+            (player_id, player_name.strip(), card_year, manufacturer.strip(),
+             set_name.strip(), card_number, parallel or "Base", is_numbered,
+             numbered_to, serial_number, is_autograph, is_rookie,
+             grade or "Raw", purchase_price, purchase_date, notes, user_email),
+        )
+        card = dict(cursor.fetchone())
+    return card
 
 
 def update_portfolio_card(card_id, **kwargs):
@@ -570,31 +896,26 @@ def update_portfolio_card(card_id, **kwargs):
     updates["updated_at"] = datetime.now().isoformat()
     set_clause = ", ".join(f"{k} = ?" for k in updates)
     values = list(updates.values()) + [card_id]
-    conn = get_connection()
-    conn.execute(f"UPDATE portfolio_cards SET {set_clause} WHERE id = ?", values)
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(f"UPDATE portfolio_cards SET {set_clause} WHERE id = ?", values)
 
 
 def delete_portfolio_card(card_id, user_email=None):
     """Delete a portfolio card. If user_email is provided, only delete if it belongs to that user."""
-    conn = get_connection()
-    if user_email:
-        # Verify ownership first
-        row = conn.execute(
-            "SELECT user_email FROM portfolio_cards WHERE id = ?", (card_id,)
-        ).fetchone()
-        if not row or (row["user_email"] and row["user_email"] != user_email):
-            conn.close()
-            return False
-    conn.execute("DELETE FROM portfolio_price_history WHERE portfolio_card_id = ?", (card_id,))
-    conn.execute("DELETE FROM portfolio_cards WHERE id = ?", (card_id,))
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        if user_email:
+            # Verify ownership first
+            row = conn.execute(
+                "SELECT user_email FROM portfolio_cards WHERE id = ?", (card_id,)
+            ).fetchone()
+            if not row or (row["user_email"] and row["user_email"] != user_email):
+                return False
+        conn.execute("DELETE FROM portfolio_price_history WHERE portfolio_card_id = ?", (card_id,))
+        conn.execute("DELETE FROM portfolio_cards WHERE id = ?", (card_id,))
     return True
 
 
-def get_portfolio_cards(status="active", user_email=None):
+def iter_portfolio_cards(status="active", user_email=None):
     conn = get_connection()
     query = """
         SELECT pc.*,
@@ -602,11 +923,12 @@ def get_portfolio_cards(status="active", user_email=None):
                ph.source as price_source,
                ph.recorded_date as price_date
         FROM portfolio_cards pc
-        LEFT JOIN portfolio_price_history ph ON pc.id = ph.portfolio_card_id
-            AND ph.recorded_date = (
-                SELECT MAX(ph2.recorded_date) FROM portfolio_price_history ph2
-                WHERE ph2.portfolio_card_id = pc.id
-            )
+        LEFT JOIN (
+            SELECT *, RANK() OVER (
+                PARTITION BY portfolio_card_id ORDER BY recorded_date DESC
+            ) AS _rank
+            FROM portfolio_price_history
+        ) ph ON pc.id = ph.portfolio_card_id AND ph._rank = 1
     """
     conditions = []
     params = []
@@ -619,33 +941,28 @@ def get_portfolio_cards(status="active", user_email=None):
     if conditions:
         query += " WHERE " + " AND ".join(conditions)
     query += " ORDER BY pc.player_name, pc.card_year"
-    rows = conn.execute(query, params).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    for row in conn.execute(query, params):
+        yield dict(row)
+
+
+def get_portfolio_cards(status="active", user_email=None):
+    return list(iter_portfolio_cards(status, user_email))
 
 
 def get_portfolio_card(card_id):
     conn = get_connection()
     row = conn.execute("SELECT * FROM portfolio_cards WHERE id = ?", (card_id,)).fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
 def add_portfolio_price(portfolio_card_id, price, source, sale_type=None,
                         title=None, match_confidence=1.0, recorded_date=None):
-    if recorded_date is None:
-        recorded_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO portfolio_price_history
-           (portfolio_card_id, price, source, sale_type, title,
-            match_confidence, recorded_date)
-           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-        (portfolio_card_id, price, source, sale_type, title,
-         match_confidence, recorded_date),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            SQL_INSERT_PORTFOLIO_PRICE,
+            (portfolio_card_id, price, source, sale_type, title,
+             match_confidence, recorded_date),
+        )
 
 
 def get_portfolio_price_history(portfolio_card_id, days_back=None):
@@ -654,11 +971,10 @@ def get_portfolio_price_history(portfolio_card_id, days_back=None):
                WHERE portfolio_card_id = ?"""
     params = [portfolio_card_id]
     if days_back:
-        query += " AND recorded_date >= date('now', ?)"
-        params.append(f"-{days_back} days")
+        query += " AND recorded_date >= ?"
+        params.append((date.today() - timedelta(days=days_back)).isoformat())
     query += " ORDER BY recorded_date"
     rows = conn.execute(query, params).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
@@ -668,26 +984,24 @@ def add_title_mapping(raw_title, player_name=None, card_year=None,
                       manufacturer=None, set_name=None, parallel=None,
                       is_numbered=None, numbered_to=None, is_autograph=None,
                       is_rookie=None, grade=None, source=None, confirmed=0):
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO card_title_mappings
-           (raw_title, player_name, card_year, manufacturer, set_name,
-            parallel, is_numbered, numbered_to, is_autograph, is_rookie,
-            grade, source, confirmed)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(raw_title) DO UPDATE SET
-             player_name = COALESCE(excluded.player_name, player_name),
-             card_year = COALESCE(excluded.card_year, card_year),
-             manufacturer = COALESCE(excluded.manufacturer, manufacturer),
-             set_name = COALESCE(excluded.set_name, set_name),
-             parallel = COALESCE(excluded.parallel, parallel),
-             confirmed = MAX(confirmed, excluded.confirmed)""",
-        (raw_title, player_name, card_year, manufacturer, set_name,
-         parallel, is_numbered, numbered_to, is_autograph, is_rookie,
-         grade, source, confirmed),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            """INSERT INTO card_title_mappings
+               (raw_title, player_name, card_year, manufacturer, set_name,
+                parallel, is_numbered, numbered_to, is_autograph, is_rookie,
+                grade, source, confirmed)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(raw_title) DO UPDATE SET
+                 player_name = COALESCE(excluded.player_name, player_name),
+                 card_year = COALESCE(excluded.card_year, card_year),
+                 manufacturer = COALESCE(excluded.manufacturer, manufacturer),
+                 set_name = COALESCE(excluded.set_name, set_name),
+                 parallel = COALESCE(excluded.parallel, parallel),
+                 confirmed = MAX(confirmed, excluded.confirmed)""",
+            (raw_title, player_name, card_year, manufacturer, set_name,
+             parallel, is_numbered, numbered_to, is_autograph, is_rookie,
+             grade, source, confirmed),
+        )
 
 
 def find_title_mapping(raw_title):
@@ -695,7 +1009,6 @@ def find_title_mapping(raw_title):
     row = conn.execute(
         "SELECT * FROM card_title_mappings WHERE raw_title = ?", (raw_title,)
     ).fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
@@ -707,36 +1020,14 @@ def add_player_stats(player_id, season, stat_type="season_avg", game_date=None,
                      steals_per_game=None, blocks_per_game=None,
                      fg_pct=None, three_pct=None, ft_pct=None,
                      minutes_per_game=None, source_url=None, scraped_date=None):
-    if scraped_date is None:
-        scraped_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO player_stats
-           (player_id, season, stat_type, game_date, opponent, games_played,
-            points_per_game, rebounds_per_game, assists_per_game,
-            steals_per_game, blocks_per_game, fg_pct, three_pct, ft_pct,
-            minutes_per_game, source_url, scraped_date)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-           ON CONFLICT(player_id, season, stat_type, game_date) DO UPDATE SET
-             games_played = excluded.games_played,
-             points_per_game = excluded.points_per_game,
-             rebounds_per_game = excluded.rebounds_per_game,
-             assists_per_game = excluded.assists_per_game,
-             steals_per_game = excluded.steals_per_game,
-             blocks_per_game = excluded.blocks_per_game,
-             fg_pct = excluded.fg_pct,
-             three_pct = excluded.three_pct,
-             ft_pct = excluded.ft_pct,
-             minutes_per_game = excluded.minutes_per_game,
-             source_url = excluded.source_url,
-             scraped_date = excluded.scraped_date""",
-        (player_id, season, stat_type, game_date, opponent, games_played,
-         points_per_game, rebounds_per_game, assists_per_game,
-         steals_per_game, blocks_per_game, fg_pct, three_pct, ft_pct,
-         minutes_per_game, source_url, scraped_date),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            SQL_UPSERT_PLAYER_STATS,
+            (player_id, season, stat_type, game_date, opponent, games_played,
+             points_per_game, rebounds_per_game, assists_per_game,
+             steals_per_game, blocks_per_game, fg_pct, three_pct, ft_pct,
+             minutes_per_game, source_url, scraped_date),
+        )
 
 
 def get_player_stats(player_id, season=None):
@@ -748,31 +1039,23 @@ def get_player_stats(player_id, season=None):
         params.append(season)
     query += " ORDER BY season DESC, game_date DESC NULLS LAST"
     rows = conn.execute(query, params).fetchall()
-    conn.close()
     return [dict(r) for r in rows]
 
 
 def add_player_status(player_id, status, reason=None, detected_date=None):
-    if detected_date is None:
-        detected_date = date.today().isoformat()
-    conn = get_connection()
-    conn.execute(
-        """INSERT INTO player_status_log (player_id, status, reason, detected_date)
-           VALUES (?, ?, ?, ?)""",
-        (player_id, status, reason, detected_date),
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            SQL_INSERT_PLAYER_STATUS,
+            (player_id, status, reason, detected_date),
+        )
 
 
 def get_player_status_log(player_id):
     conn = get_connection()
-    rows = conn.execute(
+    return conn.execute(
         "SELECT * FROM player_status_log WHERE player_id = ? ORDER BY detected_date DESC",
         (player_id,),
     ).fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
 
 
 def get_player_latest_status(player_id):
@@ -781,7 +1064,6 @@ def get_player_latest_status(player_id):
         "SELECT * FROM player_status_log WHERE player_id = ? ORDER BY detected_date DESC LIMIT 1",
         (player_id,),
     ).fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
@@ -789,184 +1071,208 @@ def get_all_player_names():
     """Get all player names for autocomplete."""
     conn = get_connection()
     rows = conn.execute("SELECT DISTINCT name FROM players ORDER BY name").fetchall()
-    conn.close()
     return [r["name"] for r in rows]
 
 
 def update_player_photo(player_id, photo_url):
     """Update player's photo URL."""
-    conn = get_connection()
-    conn.execute(
-        "UPDATE players SET photo_url = ?, updated_at = datetime('now') WHERE id = ?",
-        (photo_url, player_id)
-    )
-    conn.commit()
-    conn.close()
+    with write_connection() as conn:
+        conn.execute(
+            "UPDATE players SET photo_url = ?, updated_at = datetime('now') WHERE id = ?",
+            (photo_url, player_id)
+        )
 
 
 def update_player_tier(player_id, tier):
     """Update player's tier rating (A/B/C/D)."""
     if tier and tier.upper() not in ('A', 'B', 'C', 'D'):
         raise ValueError("Tier must be A, B, C, or D")
-    conn = get_connection()
-    conn.execute(
-        "UPDATE players SET tier = ?, updated_at = datetime('now') WHERE id = ?",
-        (tier.upper() if tier else None, player_id)
-    )
-    conn.commit()
-    conn.close()
+    tier = tier.upper() if tier else None
+    with write_connection() as conn:
+        # No-op when unchanged, so re-saving the same tier writes nothing
+        conn.execute(
+            "UPDATE players SET tier = ?, updated_at = datetime('now') WHERE id = ? AND tier IS NOT ?",
+            (tier, player_id, tier)
+        )
 
 
 def update_player_country(player_id, country):
     """Update player's country code (ISO 2-letter)."""
-    conn = get_connection()
-    conn.execute(
-        "UPDATE players SET country = ?, updated_at = datetime('now') WHERE id = ?",
-        (country.upper() if country else None, player_id)
-    )
-    conn.commit()
-    conn.close()
+    country = country.upper() if country else None
+    with write_connection() as conn:
+        # No-op when unchanged, so re-saving the same country writes nothing
+        conn.execute(
+            "UPDATE players SET country = ?, updated_at = datetime('now') WHERE id = ? AND country IS NOT ?",
+            (country, player_id, country)
+        )
 
 
 def get_player_full_profile(player_id):
     """Get complete player data including stats, rankings, card values, status."""
+    return get_player_full_profiles([player_id]).get(player_id)
+
+
+def _without_rn(row):
+    """dict(row) minus the _rn column added by a ROW_NUMBER() subquery."""
+    record = dict(row)
+    del record["_rn"]
+    return record
+
+
+def get_player_full_profiles(player_ids):
+    """Full profiles for many players in five queries, one per section.
+
+    Returns {player_id: profile} shaped like get_player_full_profile();
+    unknown ids are left out.
+    """
     conn = get_connection()
+    ids = json.dumps(list(player_ids))
 
     # Basic player info
-    player = conn.execute(
-        "SELECT * FROM players WHERE id = ?", (player_id,)
-    ).fetchone()
-    if not player:
-        conn.close()
-        return None
-
-    profile = dict(player)
+    profiles = {
+        row["id"]: dict(row, stats=[], rankings=[], card_values=[], status=None)
+        for row in conn.execute(
+            "SELECT * FROM players WHERE id IN (SELECT value FROM json_each(?))", (ids,)
+        )
+    }
+    if not profiles:
+        return {}
 
     # Season stats
-    stats = conn.execute("""
+    for row in conn.execute("""
         SELECT * FROM player_stats
-        WHERE player_id = ? AND stat_type = 'season_avg'
-        ORDER BY season DESC
-    """, (player_id,)).fetchall()
-    profile['stats'] = [dict(s) for s in stats]
-
-    # Latest rankings from each source
-    rankings = conn.execute("""
-        SELECT r.* FROM rankings r
-        INNER JOIN (
-            SELECT source, MAX(scrape_date) as max_date
-            FROM rankings WHERE player_id = ?
-            GROUP BY source
-        ) latest ON r.source = latest.source AND r.scrape_date = latest.max_date
-        WHERE r.player_id = ?
-        ORDER BY r.rank
-    """, (player_id, player_id)).fetchall()
-    profile['rankings'] = [dict(r) for r in rankings]
-
-    # Card values
-    card_values = conn.execute("""
-        SELECT * FROM card_values
-        WHERE player_id = ?
-        ORDER BY recorded_date DESC
-        LIMIT 10
-    """, (player_id,)).fetchall()
-    profile['card_values'] = [dict(cv) for cv in card_values]
+        WHERE player_id IN (SELECT value FROM json_each(?)) AND stat_type = 'season_avg'
+        ORDER BY player_id, season DESC
+    """, (ids,)):
+        profiles[row["player_id"]]["stats"].append(dict(row))
+
+    # Latest rankings from each source; the windowed sections select *
+    # (so new columns come through) and drop the helper _rn column
+    for row in conn.execute("""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY player_id, source ORDER BY scrape_date DESC
+            ) AS _rn
+            FROM rankings
+            WHERE player_id IN (SELECT value FROM json_each(?))
+        )
+        WHERE _rn = 1
+        ORDER BY player_id, rank
+    """, (ids,)):
+        profiles[row["player_id"]]["rankings"].append(_without_rn(row))
+
+    # Last 10 card values
+    for row in conn.execute("""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY player_id ORDER BY recorded_date DESC
+            ) AS _rn
+            FROM card_values
+            WHERE player_id IN (SELECT value FROM json_each(?))
+        )
+        WHERE _rn <= 10
+        ORDER BY player_id, recorded_date DESC
+    """, (ids,)):
+        profiles[row["player_id"]]["card_values"].append(_without_rn(row))
 
     # Latest status
-    status = conn.execute("""
-        SELECT * FROM player_status_log
-        WHERE player_id = ?
-        ORDER BY detected_date DESC
-        LIMIT 1
-    """, (player_id,)).fetchone()
-    profile['status'] = dict(status) if status else None
+    for row in conn.execute("""
+        SELECT * FROM (
+            SELECT *, ROW_NUMBER() OVER (
+                PARTITION BY player_id ORDER BY detected_date DESC
+            ) AS _rn
+            FROM player_status_log
+            WHERE player_id IN (SELECT value FROM json_each(?))
+        )
+        WHERE _rn = 1
+    """, (ids,)):
+        profiles[row["player_id"]]["status"] = _without_rn(row)
 
-    conn.close()
-    return profile
+    return profiles
 
 
-def get_players_for_dashboard(draft_year, sport=None):
-    """Get all players with photos, tiers, and basic info for dashboard grid.
+def iter_players_for_dashboard(draft_year, sport=None):
+    """Yield players with photos, tiers, and basic info for the dashboard grid.
+
+    Players come out in dashboard order, one dict at a time.
 
     Args:
         draft_year: The draft year to filter by
-        sport: Optional sport filter (WNBA, NBA, NFL, etc.). If None, returns all sports.
+        sport: Optional sport filter (WNBA, NBA, NFL, etc.). If None, yields all sports.
     """
     conn = get_connection()
 
-    # Get players with their consensus ranking
+    # Consensus ranking from each source's latest ranking of the class
+    query = """
+        SELECT p.*,
+               AVG(r.rank) as avg_rank,
+               COUNT(DISTINCT r.source) as source_count
+        FROM players p
+        LEFT JOIN (
+            SELECT player_id, source, rank, ROW_NUMBER() OVER (
+                PARTITION BY player_id, source ORDER BY scrape_date DESC
+            ) AS _rn
+            FROM rankings
+            WHERE player_id IN (SELECT id FROM players WHERE draft_year = ?)
+        ) r ON p.id = r.player_id AND r._rn = 1
+        WHERE p.draft_year = ?
+    """
+    params = [draft_year, draft_year]
     if sport:
-        rows = conn.execute("""
-            SELECT p.*,
-                   AVG(r.rank) as avg_rank,
-                   COUNT(DISTINCT r.source) as source_count
-            FROM players p
-            LEFT JOIN rankings r ON p.id = r.player_id
-                AND r.scrape_date = (
-                    SELECT MAX(r2.scrape_date) FROM rankings r2
-                    WHERE r2.player_id = p.id AND r2.source = r.source
-                )
-            WHERE p.draft_year = ? AND p.sport = ?
-            GROUP BY p.id
-            ORDER BY COALESCE(AVG(r.rank), 999), p.name
-        """, (draft_year, sport.upper())).fetchall()
-    else:
-        rows = conn.execute("""
-            SELECT p.*,
-                   AVG(r.rank) as avg_rank,
-                   COUNT(DISTINCT r.source) as source_count
-            FROM players p
-            LEFT JOIN rankings r ON p.id = r.player_id
-                AND r.scrape_date = (
-                    SELECT MAX(r2.scrape_date) FROM rankings r2
-                    WHERE r2.player_id = p.id AND r2.source = r.source
-                )
-            WHERE p.draft_year = ?
-            GROUP BY p.id
-            ORDER BY COALESCE(AVG(r.rank), 999), p.name
-        """, (draft_year,)).fetchall()
-
-    conn.close()
-    return [dict(r) for r in rows]
+        query += " AND p.sport = ?"
+        params.append(sport.upper())
+    query += """
+        GROUP BY p.id
+        ORDER BY COALESCE(AVG(r.rank), 999), p.name
+    """
+    for row in conn.execute(query, params):
+        yield dict(row)
+
+
+def get_players_for_dashboard(draft_year, sport=None):
+    """Get all players with photos, tiers, and basic info for dashboard grid.
+
+    Args:
+        draft_year: The draft year to filter by
+        sport: Optional sport filter (WNBA, NBA, NFL, etc.). If None, returns all sports.
+    """
+    return list(iter_players_for_dashboard(draft_year, sport))
 
 
 def get_player_by_id(player_id):
     """Get a single player by ID."""
     conn = get_connection()
     row = conn.execute("SELECT * FROM players WHERE id = ?", (player_id,)).fetchone()
-    conn.close()
     return dict(row) if row else None
 
 
 def get_available_sports():
     """Get list of sports that have players in the database."""
     conn = get_connection()
-    rows = conn.execute(
-        "SELECT DISTINCT sport FROM players WHERE sport IS NOT NULL ORDER BY sport"
-    ).fetchall()
-    conn.close()
+    rows = _fetch_tuples(
+        conn, "SELECT DISTINCT sport FROM players WHERE sport IS NOT NULL ORDER BY sport"
+    )
     return [r[0] for r in rows]
 
 
 def get_draft_years_for_sport(sport):
     """Get list of draft years that have players for a given sport."""
     conn = get_connection()
-    rows = conn.execute(
+    rows = _fetch_tuples(
+        conn,
         "SELECT DISTINCT draft_year FROM players WHERE sport = ? ORDER BY draft_year",
         (sport.upper(),)
-    ).fetchall()
-    conn.close()
+    )
     return [r[0] for r in rows]
 
 
 def get_player_count_by_sport():
     """Get count of players per sport."""
     conn = get_connection()
-    rows = conn.execute(
+    return dict(_fetch_tuples(
+        conn,
         """SELECT sport, COUNT(*) as count
            FROM players
            GROUP BY sport
            ORDER BY sport"""
-    ).fetchall()
-    conn.close()
-    return {r['sport']: r['count'] for r in rows}
+    ))
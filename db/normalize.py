@@ -1,49 +1,63 @@
 """Name normalization to handle spelling variations across sources."""
 
 import re
-from db.models import get_connection
+from collections import Counter, defaultdict
+from types import MappingProxyType
+from db.models import get_connection, write_connection
 
-# Known name mappings: {variant: canonical_name}
+# Known name mappings: (variant, canonical_name)
 # Add entries here as you discover spelling differences between sources
-NAME_ALIASES = {
+_ALIAS_PAIRS = [
     # 2026 class
-    "azzi fam": "Azzi Fudd",
-    "flau'jae johnson": "Flau'Jae Johnson",
-    "flaujae johnson": "Flau'Jae Johnson",
-    "gabriela jaquez": "Gabriella Jaquez",
-    "cotie mcmahhon": "Cotie McMahon",
-    "marta suárez": "Marta Suarez",
-    "marta suarez": "Marta Suarez",
-    "ta'niya latson": "Ta'Niya Latson",
-    "taniya latson": "Ta'Niya Latson",
-    "serah williams": "Sarah Williams",
+    ("azzi fam", "Azzi Fudd"),
+    ("flau'jae johnson", "Flau'Jae Johnson"),
+    ("flaujae johnson", "Flau'Jae Johnson"),
+    ("gabriela jaquez", "Gabriella Jaquez"),
+    ("cotie mcmahhon", "Cotie McMahon"),
+    ("marta suárez", "Marta Suarez"),
+    ("marta suarez", "Marta Suarez"),
+    ("ta'niya latson", "Ta'Niya Latson"),
+    ("taniya latson", "Ta'Niya Latson"),
+    ("serah williams", "Sarah Williams"),
     # 2027 class
-    "juju watkins": "JuJu Watkins",
-    "milaysia fulwiley": "MiLaysia Fulwiley",
-    "milaysia fulwiley": "MiLaysia Fulwiley",
-    "mikaylah williams": "Mikalah Williams",
-    "mikalah williams": "Mikalah Williams",
-    "zoey brooks": "Zoe Brooks",
-    "zoe brooks": "Zoe Brooks",
-    "taliah scott": "Talia Scott",
-    "talia scott": "Talia Scott",
-    "talaysia cooper": "Talausia Cooper",
-    "talausia cooper": "Talausia Cooper",
+    ("juju watkins", "JuJu Watkins"),
+    ("milaysia fulwiley", "MiLaysia Fulwiley"),
+    ("mikaylah williams", "Mikalah Williams"),
+    ("mikalah williams", "Mikalah Williams"),
+    ("zoey brooks", "Zoe Brooks"),
+    ("zoe brooks", "Zoe Brooks"),
+    ("taliah scott", "Talia Scott"),
+    ("talia scott", "Talia Scott"),
+    ("talaysia cooper", "Talausia Cooper"),
+    ("talausia cooper", "Talausia Cooper"),
     # 2028 class
-    "sara strong": "Sarah Strong",
-    "sarah strong": "Sarah Strong",
-    "jana eli alfy": "Jana El Alfy",
-    "jana el alfy": "Jana El Alfy",
-    "tajanna roberts": "Tajianna Roberts",
-    "tajianna roberts": "Tajianna Roberts",
-    "kiyomi mcmiller": "Kiyomi McMiller",
-}
+    ("sara strong", "Sarah Strong"),
+    ("sarah strong", "Sarah Strong"),
+    ("jana eli alfy", "Jana El Alfy"),
+    ("jana el alfy", "Jana El Alfy"),
+    ("tajanna roberts", "Tajianna Roberts"),
+    ("tajianna roberts", "Tajianna Roberts"),
+    ("kiyomi mcmiller", "Kiyomi McMiller"),
+]
+
+NAME_ALIASES = dict(_ALIAS_PAIRS)
+if len(NAME_ALIASES) != len(_ALIAS_PAIRS):
+    _counts = Counter(variant for variant, _ in _ALIAS_PAIRS)
+    raise ValueError(f"Duplicate name aliases: {sorted(v for v, n in _counts.items() if n > 1)}")
+# Read-only, so nothing can change the mapping after import
+NAME_ALIASES = MappingProxyType(NAME_ALIASES)
 
 
 def normalize_name(name):
     """Return the canonical form of a player name."""
-    key = name.strip().lower()
-    return NAME_ALIASES.get(key, name.strip())
+    name = name.strip()
+    return NAME_ALIASES.get(name.lower(), name)
+
+
+def normalize_names_bulk(names):
+    """Return the canonical form of each name, like normalize_name."""
+    aliases_get = NAME_ALIASES.get
+    return [aliases_get(name.lower(), name) for name in map(str.strip, names)]
 
 
 def merge_duplicate_players():
@@ -53,18 +67,23 @@ def merge_duplicate_players():
     # Get all players
     players = conn.execute("SELECT id, name, draft_year FROM players ORDER BY id").fetchall()
 
-    # Group by (normalized_name, draft_year)
-    groups = {}
-    for p in players:
-        key = (normalize_name(p["name"]).lower(), p["draft_year"])
-        groups.setdefault(key, []).append(dict(p))
+    # Group by (normalized_name, draft_year), normalizing each name once;
+    # the first player's normalized name is the group's canonical name
+    groups = defaultdict(list)
+    canonical_names = {}
+    normalized_names = normalize_names_bulk([p["name"] for p in players])
+    for p, normalized in zip(players, normalized_names):
+        key = (normalized.lower(), p["draft_year"])
+        groups[key].append(p)
+        canonical_names.setdefault(key, normalized)
 
-    merged_count = 0
+    renames = []
+    pairs = []
     for key, dupes in groups.items():
         if len(dupes) < 2:
             continue
 
-        canonical_name = normalize_name(dupes[0]["name"])
+        canonical_name = canonical_names[key]
 
         # Prefer the record that already has the canonical name
         canonical = None
@@ -77,27 +96,26 @@ def merge_duplicate_players():
 
         # Update canonical record's name to the normalized form
         if canonical["name"] != canonical_name:
-            conn.execute("UPDATE players SET name = ? WHERE id = ?",
-                         (canonical_name, canonical["id"]))
+            renames.append((canonical_name, canonical["id"]))
 
         for dupe in dupes:
             if dupe["id"] == canonical["id"]:
                 continue
-            # Move rankings to canonical player
-            conn.execute("UPDATE OR IGNORE rankings SET player_id = ? WHERE player_id = ?",
-                         (canonical["id"], dupe["id"]))
-            # Move card values
-            conn.execute("UPDATE OR IGNORE card_values SET player_id = ? WHERE player_id = ?",
-                         (canonical["id"], dupe["id"]))
-            # Delete leftover rankings (conflicts from OR IGNORE)
-            conn.execute("DELETE FROM rankings WHERE player_id = ?", (dupe["id"],))
-            conn.execute("DELETE FROM card_values WHERE player_id = ?", (dupe["id"],))
-            # Delete duplicate player
-            conn.execute("DELETE FROM players WHERE id = ?", (dupe["id"],))
+            pairs.append((canonical["id"], dupe["id"]))
             print(f"  Merged '{dupe['name']}' -> '{canonical_name}'")
-            merged_count += 1
 
-    conn.commit()
-    conn.close()
+    # Apply every merge in one transaction, one executemany per statement
+    dupe_ids = [(dupe_id,) for _, dupe_id in pairs]
+    with write_connection() as wconn:
+        wconn.executemany("UPDATE players SET name = ? WHERE id = ?", renames)
+        # Move rankings and card values to the canonical player
+        wconn.executemany("UPDATE OR IGNORE rankings SET player_id = ? WHERE player_id = ?", pairs)
+        wconn.executemany("UPDATE OR IGNORE card_values SET player_id = ? WHERE player_id = ?", pairs)
+        # Delete leftovers (conflicts from OR IGNORE), then the duplicates
+        wconn.executemany("DELETE FROM rankings WHERE player_id = ?", dupe_ids)
+        wconn.executemany("DELETE FROM card_values WHERE player_id = ?", dupe_ids)
+        wconn.executemany("DELETE FROM players WHERE id = ?", dupe_ids)
+
+    merged_count = len(pairs)
     print(f"Merged {merged_count} duplicate players")
     return merged_count
@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Create app icons using the exact logo from the app screenshot"""
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -17,9 +20,8 @@ def draw_trend_arrow(draw, x, y, size, color, line_width):
         (x + size * 0.8, y)  # End top right
     ]
 
-    # Draw the line segments
-    for i in range(len(points) - 1):
-        draw.line([points[i], points[i+1]], fill=color, width=line_width)
+    # Draw the trend line as one polyline
+    draw.line(points, fill=color, width=line_width, joint="curve")
 
     # Draw arrow head at the end
     arrow_x, arrow_y = points[-1]
@@ -27,8 +29,8 @@ def draw_trend_arrow(draw, x, y, size, color, line_width):
     draw.line([arrow_x, arrow_y, arrow_x + arrow_size, arrow_y + arrow_size], fill=color, width=line_width)
     draw.line([arrow_x, arrow_y, arrow_x, arrow_y + arrow_size], fill=color, width=line_width)
 
-def create_icon(size, output_path):
-    """Create app icon matching the screenshot logo"""
+def draw_icon(size):
+    """Draw the app icon matching the screenshot logo"""
     img = Image.new('RGB', (size, size), BLACK)
     draw = ImageDraw.Draw(img)
 
@@ -65,7 +67,16 @@ def create_icon(size, output_path):
     # Draw "Stream" in green right after
     draw.text((text_x + collector_width, text_y), "Stream", fill=GREEN, font=font)
 
-    img.save(output_path, 'PNG', quality=100)
+    return img
+
+def create_icon(master, size, output_path):
+    """Downsample the full-size master to one icon size and save it"""
+    if size == master.width:
+        # The 1024 App Store asset gets the smallest file
+        img, options = master, {'optimize': True}
+    else:
+        img, options = master.resize((size, size), Image.Resampling.LANCZOS), {'compress_level': 1}
+    img.save(output_path, 'PNG', **options)
     print(f"✓ Created {size}x{size}")
 
 def main():
@@ -80,8 +91,12 @@ def main():
         'icon_76x76.png': 76,
     }
 
-    for filename, size in sizes.items():
-        create_icon(size, os.path.join(output_dir, filename))
+    # Draw once at full size; smaller sizes are downsampled from it
+    master = draw_icon(1024)
+    # Resize and save the sizes in parallel; Pillow releases the GIL for both
+    output_paths = [os.path.join(output_dir, filename) for filename in sizes]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(partial(create_icon, master), sizes.values(), output_paths))
 
     print("\n✅ All app icons created with CollectorStream logo!")
 
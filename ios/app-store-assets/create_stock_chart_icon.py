@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Create app icons with stock chart L-axis and price line"""
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -8,8 +11,8 @@ BLACK = (0, 0, 0)
 GREEN = (16, 185, 129)  # #10b981
 WHITE = (255, 255, 255)
 
-def create_icon(size, output_path):
-    """Create app icon with stock chart design"""
+def draw_icon(size):
+    """Draw the app icon with stock chart design"""
     img = Image.new('RGB', (size, size), BLACK)
     draw = ImageDraw.Draw(img)
 
@@ -53,10 +56,9 @@ def create_icon(size, output_path):
         (100 * scale, -30 * scale),  # Continue rising
     ]
 
-    # Draw the price line segments
+    # Draw the price line as one polyline
     points = [(line_start_x + px, line_y_center + py) for px, py in price_points]
-    for i in range(len(points) - 1):
-        draw.line([points[i], points[i+1]], fill=GREEN, width=line_width)
+    draw.line(points, fill=GREEN, width=line_width, joint="curve")
 
     # Draw arrow at the end pointing RIGHT (>)
     last_x, last_y = points[-1]
@@ -82,8 +84,7 @@ def create_icon(size, output_path):
             # Skip text on very small icons
             if size >= 120:
                 print(f"Warning: Using default font for {size}x{size}")
-            img.save(output_path, 'PNG', quality=100)
-            return
+            return img
 
     # Draw "Collector" in white
     draw.text((text_x, text_y), "Collector", fill=WHITE, font=font)
@@ -96,7 +97,16 @@ def create_icon(size, output_path):
 
     draw.text((text_x + collector_width, text_y), "Stream", fill=GREEN, font=font)
 
-    img.save(output_path, 'PNG', quality=100)
+    return img
+
+def create_icon(master, size, output_path):
+    """Downsample the full-size master to one icon size and save it"""
+    if size == master.width:
+        # The 1024 App Store asset gets the smallest file
+        img, options = master, {'optimize': True}
+    else:
+        img, options = master.resize((size, size), Image.Resampling.LANCZOS), {'compress_level': 1}
+    img.save(output_path, 'PNG', **options)
     print(f"✓ Created {size}x{size}")
 
 def main():
@@ -112,8 +122,12 @@ def main():
     }
 
     print("Creating stock chart app icons...")
-    for filename, size in sizes.items():
-        create_icon(size, os.path.join(output_dir, filename))
+    # Draw once at full size; smaller sizes are downsampled from it
+    master = draw_icon(1024)
+    # Resize and save the sizes in parallel; Pillow releases the GIL for both
+    output_paths = [os.path.join(output_dir, filename) for filename in sizes]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(partial(create_icon, master), sizes.values(), output_paths))
 
     print("\n✅ All app icons created with stock chart logo!")
 
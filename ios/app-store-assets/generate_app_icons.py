@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Generate CollectorStream app icons with black background, green bolt, white text"""
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -9,8 +12,8 @@ BLACK = (10, 10, 10)  # Almost black
 GREEN = (16, 185, 129)  # #10b981
 WHITE = (255, 255, 255)
 
-def create_icon(size, output_path):
-    """Create app icon with logo"""
+def draw_icon(size):
+    """Draw the app icon with logo"""
     # Create image with black background
     img = Image.new('RGB', (size, size), BLACK)
     draw = ImageDraw.Draw(img)
@@ -58,8 +61,16 @@ def create_icon(size, output_path):
     # Draw text
     draw.text((text_x, text_y), text, fill=WHITE, font=font)
 
-    # Save
-    img.save(output_path, 'PNG', quality=100)
+    return img
+
+def create_icon(master, size, output_path):
+    """Downsample the full-size master to one icon size and save it"""
+    if size == master.width:
+        # The 1024 App Store asset gets the smallest file
+        img, options = master, {'optimize': True}
+    else:
+        img, options = master.resize((size, size), Image.Resampling.LANCZOS), {'compress_level': 1}
+    img.save(output_path, 'PNG', **options)
     print(f"✓ Created {size}x{size} icon: {output_path}")
 
 def main():
@@ -76,9 +87,12 @@ def main():
         'icon_76x76.png': 76,
     }
 
-    for filename, size in sizes.items():
-        output_path = os.path.join(output_dir, filename)
-        create_icon(size, output_path)
+    # Draw once at full size; smaller sizes are downsampled from it
+    master = draw_icon(1024)
+    # Resize and save the sizes in parallel; Pillow releases the GIL for both
+    output_paths = [os.path.join(output_dir, filename) for filename in sizes]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(partial(create_icon, master), sizes.values(), output_paths))
 
     print(f"\n✅ All {len(sizes)} app icons created successfully!")
 
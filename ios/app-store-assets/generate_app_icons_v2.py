@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Generate CollectorStream app icons with black background, green trend arrow, text"""
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -9,8 +12,8 @@ BLACK = (10, 10, 10)
 GREEN = (16, 185, 129)  # #10b981
 WHITE = (255, 255, 255)
 
-def create_icon(size, output_path):
-    """Create app icon with upward trending chart logo"""
+def draw_icon(size):
+    """Draw the app icon with upward trending chart logo"""
     img = Image.new('RGB', (size, size), BLACK)
     draw = ImageDraw.Draw(img)
 
@@ -33,8 +36,7 @@ def create_icon(size, output_path):
     x3, y3 = icon_left + int(icon_width * 0.7), icon_top + int(chart_height * 0.1)
 
     # Draw the trending line
-    draw.line([x1, y1, x2, y2], fill=GREEN, width=line_width)
-    draw.line([x2, y2, x3, y3], fill=GREEN, width=line_width)
+    draw.line([x1, y1, x2, y2, x3, y3], fill=GREEN, width=line_width, joint="curve")
 
     # Draw arrow head at the end
     arrow_size = int(30 * scale)
@@ -57,10 +59,8 @@ def create_icon(size, output_path):
     try:
         font_size = int(90 * scale)
         font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-        font_bold = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
     except:
         font = ImageFont.load_default()
-        font_bold = font
 
     # Calculate text positioning for horizontal layout
     text1 = "Collector"
@@ -81,7 +81,16 @@ def create_icon(size, output_path):
     # Draw "Stream" in green
     draw.text((text_x + width1 + int(10 * scale), text_y), text2, fill=GREEN, font=font)
 
-    img.save(output_path, 'PNG', quality=100)
+    return img
+
+def create_icon(master, size, output_path):
+    """Downsample the full-size master to one icon size and save it"""
+    if size == master.width:
+        # The 1024 App Store asset gets the smallest file
+        img, options = master, {'optimize': True}
+    else:
+        img, options = master.resize((size, size), Image.Resampling.LANCZOS), {'compress_level': 1}
+    img.save(output_path, 'PNG', **options)
     print(f"✓ Created {size}x{size} icon")
 
 def main():
@@ -97,9 +106,12 @@ def main():
         'icon_76x76.png': 76,
     }
 
-    for filename, size in sizes.items():
-        output_path = os.path.join(output_dir, filename)
-        create_icon(size, output_path)
+    # Draw once at full size; smaller sizes are downsampled from it
+    master = draw_icon(1024)
+    # Resize and save the sizes in parallel; Pillow releases the GIL for both
+    output_paths = [os.path.join(output_dir, filename) for filename in sizes]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(partial(create_icon, master), sizes.values(), output_paths))
 
     print(f"\n✅ All {len(sizes)} app icons created!")
 
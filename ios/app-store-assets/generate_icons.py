@@ -4,6 +4,9 @@ Generate CollectorStream app icons in all required sizes.
 Uses PIL to create a simple but professional icon with the app branding.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from PIL import Image, ImageDraw, ImageFont
 import os
 
@@ -12,6 +15,9 @@ BG_COLOR = "#0a0a0a"  # Black background
 ACCENT_COLOR = "#10b981"  # Green accent
 CARD_COLOR = "#151515"  # Card background
 
+# Size the icon is drawn at; every other size is resized from it
+MASTER_SIZE = 1024
+
 # Icon sizes needed for App Store
 SIZES = {
     "App Store": 1024,
@@ -38,10 +44,9 @@ def create_icon(size):
     # Card 1 (back card)
     card1_x = padding
     card1_y = padding + (size * 0.05)
-    draw_rounded_rectangle(
-        draw,
+    draw.rounded_rectangle(
         [(card1_x, card1_y), (card1_x + card_width, card1_y + card_height)],
-        corner_radius,
+        radius=corner_radius,
         fill=CARD_COLOR,
         outline=ACCENT_COLOR,
         width=int(size * 0.02)
@@ -50,10 +55,9 @@ def create_icon(size):
     # Card 2 (front card)
     card2_x = size - padding - card_width
     card2_y = padding
-    draw_rounded_rectangle(
-        draw,
+    draw.rounded_rectangle(
         [(card2_x, card2_y), (card2_x + card_width, card2_y + card_height)],
-        corner_radius,
+        radius=corner_radius,
         fill=CARD_COLOR,
         outline=ACCENT_COLOR,
         width=int(size * 0.02)
@@ -98,34 +102,17 @@ def create_icon(size):
 
     return img
 
-def draw_rounded_rectangle(draw, coords, radius, fill=None, outline=None, width=1):
-    """Draw a rounded rectangle."""
-    x1, y1 = coords[0]
-    x2, y2 = coords[1]
-
-    # Draw rectangles for sides and center
-    draw.rectangle([(x1 + radius, y1), (x2 - radius, y2)], fill=fill)
-    draw.rectangle([(x1, y1 + radius), (x2, y2 - radius)], fill=fill)
-
-    # Draw circles for corners
-    draw.ellipse([(x1, y1), (x1 + radius * 2, y1 + radius * 2)], fill=fill)
-    draw.ellipse([(x2 - radius * 2, y1), (x2, y1 + radius * 2)], fill=fill)
-    draw.ellipse([(x1, y2 - radius * 2), (x1 + radius * 2, y2)], fill=fill)
-    draw.ellipse([(x2 - radius * 2, y2 - radius * 2), (x2, y2)], fill=fill)
-
-    # Draw outline if specified
-    if outline:
-        # Top and bottom
-        draw.arc([(x1, y1), (x1 + radius * 2, y1 + radius * 2)], 180, 270, fill=outline, width=width)
-        draw.line([(x1 + radius, y1), (x2 - radius, y1)], fill=outline, width=width)
-        draw.arc([(x2 - radius * 2, y1), (x2, y1 + radius * 2)], 270, 360, fill=outline, width=width)
-
-        draw.line([(x2, y1 + radius), (x2, y2 - radius)], fill=outline, width=width)
-        draw.arc([(x2 - radius * 2, y2 - radius * 2), (x2, y2)], 0, 90, fill=outline, width=width)
-        draw.line([(x2 - radius, y2), (x1 + radius, y2)], fill=outline, width=width)
-
-        draw.arc([(x1, y2 - radius * 2), (x1 + radius * 2, y2)], 90, 180, fill=outline, width=width)
-        draw.line([(x1, y2 - radius), (x1, y1 + radius)], fill=outline, width=width)
+def save_icon(master, output_dir, name, size):
+    """Downsample the master icon to one size and write it to output_dir"""
+    print(f"Creating {name} icon ({size}x{size})...")
+    if size == MASTER_SIZE:
+        # The 1024 App Store asset gets the smallest file
+        icon, options = master, {"optimize": True}
+    else:
+        icon, options = master.resize((size, size), Image.Resampling.LANCZOS), {"compress_level": 1}
+    filename = f"{output_dir}/icon_{size}x{size}.png"
+    icon.save(filename, "PNG", **options)
+    print(f"✅ Saved: {filename}")
 
 def main():
     output_dir = "icons"
@@ -133,12 +120,13 @@ def main():
 
     print("🎨 Generating CollectorStream app icons...\n")
 
-    for name, size in SIZES.items():
-        print(f"Creating {name} icon ({size}x{size})...")
-        icon = create_icon(size)
-        filename = f"{output_dir}/icon_{size}x{size}.png"
-        icon.save(filename, "PNG")
-        print(f"✅ Saved: {filename}")
+    # Draw once at full size; smaller sizes are downsampled from it
+    master = create_icon(MASTER_SIZE)
+
+    # Pillow releases the GIL while resizing and encoding, so threads are
+    # enough to write the sizes in parallel without copying the master around
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(partial(save_icon, master, output_dir), SIZES.keys(), SIZES.values()))
 
     print(f"\n✨ All icons generated successfully!")
     print(f"\nNext steps:")
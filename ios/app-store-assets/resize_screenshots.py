@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """Resize screenshots to exact App Store Connect requirements"""
 
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from PIL import Image, features
 import os
 
 # App Store Connect requirement: 1284 × 2778px (iPhone 6.7" display)
@@ -11,14 +14,27 @@ TARGET_HEIGHT = 2778
 def resize_screenshot(input_path, output_path):
     """Resize screenshot to exact App Store dimensions"""
     img = Image.open(input_path)
+    # JPEG input can decode straight at a reduced scale; keeps >= 2x the
+    # target for LANCZOS to work with. No-op for PNG.
+    img.draft('RGB', (TARGET_WIDTH * 2, TARGET_HEIGHT * 2))
 
     # Resize to exact dimensions
     resized = img.resize((TARGET_WIDTH, TARGET_HEIGHT), Image.Resampling.LANCZOS)
 
-    # Save with high quality
-    resized.save(output_path, 'PNG', quality=100, optimize=True)
+    # PNG is lossless at any level; fastest deflate, files are upload-only
+    resized.save(output_path, 'PNG', compress_level=1)
     print(f"✓ Resized {os.path.basename(input_path)} → {TARGET_WIDTH}×{TARGET_HEIGHT}")
 
+def resize_one(filename, input_dir, output_dir):
+    """Resize one screenshot from input_dir into output_dir, if it exists"""
+    input_path = os.path.join(input_dir, filename)
+    output_path = os.path.join(output_dir, filename)
+
+    if os.path.exists(input_path):
+        resize_screenshot(input_path, output_path)
+    else:
+        print(f"⚠️  Not found: {filename}")
+
 def main():
     desktop = os.path.expanduser("~/Desktop")
     output_dir = os.path.expanduser("~/Desktop/app_store_screenshots")
@@ -37,14 +53,14 @@ def main():
 
     print(f"Resizing screenshots to {TARGET_WIDTH}×{TARGET_HEIGHT}px...\n")
 
-    for filename in screenshots:
-        input_path = os.path.join(desktop, filename)
-        output_path = os.path.join(output_dir, filename)
+    # Pillow's wheels bundle libjpeg-turbo; source builds may not
+    if not features.check_feature('libjpeg_turbo'):
+        print("⚠️  Pillow is not using libjpeg-turbo; JPEG screenshots will decode slowly\n")
 
-        if os.path.exists(input_path):
-            resize_screenshot(input_path, output_path)
-        else:
-            print(f"⚠️  Not found: {filename}")
+    # One process per screenshot; each loads, resizes and encodes independently
+    workers = min(len(screenshots), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(partial(resize_one, input_dir=desktop, output_dir=output_dir), screenshots))
 
     print(f"\n✅ All screenshots resized to App Store Connect requirements!")
     print(f"📁 Saved to: {output_dir}")
@@ -32,6 +32,7 @@ if env_path.exists():
 from db.models import (
     init_db, get_players_by_draft_year, get_latest_rankings,
     get_all_players_with_rankings, upsert_player, add_ranking,
+    maybe_analyze, checkpoint_wal, ScrapeLogger,
 )
 from analysis.movers import get_movers, get_consensus_board, card_buy_signals
 
@@ -44,6 +45,8 @@ def cmd_import(args):
     init_db()
     xlsx_path = args.file or "/Users/toddwallace/Desktop/WNBA Prospects.xlsx"
     import_spreadsheet(xlsx_path)
+    checkpoint_wal()
+    maybe_analyze()
 
 
 def cmd_scrape(args):
@@ -78,22 +81,27 @@ def cmd_scrape(args):
 
     console.print(f"[bold]Scraping {sport.upper()} mock drafts...[/bold]")
 
-    for source_key, source_config in sources.items():
-        scraper_class = get_scraper(sport, source_key)
-        if not scraper_class:
-            console.print(f"[yellow]No scraper for {source_key} ({sport}), skipping[/yellow]")
-            continue
+    # One scrape_log transaction for the whole run
+    with ScrapeLogger() as scrape_log:
+        for source_key, source_config in sources.items():
+            scraper_class = get_scraper(sport, source_key)
+            if not scraper_class:
+                console.print(f"[yellow]No scraper for {source_key} ({sport}), skipping[/yellow]")
+                continue
 
-        scraper = scraper_class()
-        urls = source_config.get("urls", {})
+            scraper = scraper_class()
+            urls = source_config.get("urls", {})
 
-        for year, url in urls.items():
-            if url is None:
-                continue  # URL not yet discovered
-            year = int(year)
-            if args.year and year != args.year:
-                continue
-            scraper.scrape(url, year)
+            for year, url in urls.items():
+                if url is None:
+                    continue  # URL not yet discovered
+                year = int(year)
+                if args.year and year != args.year:
+                    continue
+                scraper.scrape(url, year, scrape_log=scrape_log)
+
+    checkpoint_wal()
+    maybe_analyze()
 
 
 def cmd_normalize(args):
@@ -119,7 +127,6 @@ def cmd_cards(args):
             "SELECT id, name, draft_year FROM players WHERE name LIKE ?",
             (f"%{args.player}%",),
         ).fetchone()
-        conn.close()
         if not row:
             console.print(f"[red]Player '{args.player}' not found[/red]")
             return
@@ -503,8 +510,8 @@ def cmd_portfolio(args):
                     data = submission["data"]
                     # user_email is included in data from Lambda
                     user_email = data.get("user_email", "todd@fluxzi.com")
-                    card_id = add_portfolio_card(**data)
-                    print(f"  Added: {data['player_name']} — {data.get('set_name', '')} (id={card_id}, user={user_email})")
+                    card = add_portfolio_card(**data)
+                    print(f"  Added: {card['player_name']} — {card['set_name']} (id={card['id']}, user={user_email})")
                 elif submission.get("type") == "delete_card":
                     card_id = submission["card_id"]
                     user_email = submission.get("user_email")
@@ -5,7 +5,7 @@ from datetime import datetime
 from html import escape as html_escape
 from pathlib import Path
 
-from db.models import get_connection, get_players_by_draft_year, get_latest_card_values, get_watchlist_with_prices
+from db.models import get_connection, get_players_by_draft_year, iter_latest_card_values, get_watchlist_with_prices
 from analysis.movers import get_movers, get_consensus_board, card_buy_signals
 from analysis.card_prices import get_best_buys, get_price_changes
 from .styles import CSS_APP
@@ -366,7 +366,6 @@ def _get_scrape_stats():
         GROUP BY source
         ORDER BY last_scrape DESC
     """).fetchall()
-    conn.close()
     return [dict(s) for s in stats]
 
 
@@ -505,11 +504,16 @@ def generate_player_dashboard(draft_year, output_dir, sport="wnba"):
     return True
 
 
-def generate_player_detail_page(player_id, output_dir):
-    """Generate a detailed page for a single player."""
+def generate_player_detail_page(player_id, output_dir, profile=None):
+    """Generate a detailed page for a single player.
+
+    profile is the player's get_player_full_profile() dict, if the caller
+    already loaded it.
+    """
     from db.models import get_player_full_profile
 
-    profile = get_player_full_profile(player_id)
+    if profile is None:
+        profile = get_player_full_profile(player_id)
     if not profile:
         return False
 
@@ -649,13 +653,15 @@ def generate_player_detail_page(player_id, output_dir):
 
 def generate_all_player_pages(output_dir):
     """Generate detail pages for all players."""
+    from db.models import get_player_full_profiles
+
     conn = get_connection()
     players = conn.execute("SELECT id, name FROM players ORDER BY draft_year, name").fetchall()
-    conn.close()
+    profiles = get_player_full_profiles(p['id'] for p in players)
 
     count = 0
     for p in players:
-        if generate_player_detail_page(p['id'], output_dir):
+        if generate_player_detail_page(p['id'], output_dir, profiles.get(p['id'])):
             count += 1
 
     return count
@@ -778,8 +784,7 @@ def generate_card_values_page(output_dir):
     # Per-year card values
     any_data = False
     for year in DRAFT_YEARS:
-        values = get_latest_card_values(draft_year=year)
-        has_prices = [v for v in values if v.get("lowest_bin")]
+        has_prices = [v for v in iter_latest_card_values(draft_year=year) if v.get("lowest_bin")]
         if not has_prices:
             continue
         any_data = True
@@ -788,9 +793,7 @@ def generate_card_values_page(output_dir):
         html += """<table>
 <tr><th>Player</th><th>School</th><th>Lowest Auto</th>
 <th>Avg Price</th><th>Listings</th><th>eBay</th></tr>\n"""
-        for v in values:
-            if not v.get("lowest_bin"):
-                continue
+        for v in has_prices:
             lowest = f"${v['lowest_bin']:.2f}" if v.get("lowest_bin") else "-"
             avg = f"${v['avg_price']:.2f}" if v.get("avg_price") else "-"
             url = v.get("ebay_search_url") or ""
@@ -886,7 +889,6 @@ def generate_index(output_dir):
     total_players = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
     total_rankings = conn.execute("SELECT COUNT(*) FROM rankings").fetchone()[0]
     total_sources = conn.execute("SELECT COUNT(DISTINCT source) FROM rankings").fetchone()[0]
-    conn.close()
 
     html += '<div class="stats-grid">\n'
     for val, label in [
@@ -12,7 +12,7 @@ from datetime import date
 from abc import ABC
 
 from bs4 import BeautifulSoup
-from db.models import upsert_player, add_ranking, log_scrape
+from db.models import upsert_player, add_rankings_bulk, log_scrape
 
 
 class BaseScraper(ABC):
@@ -214,8 +214,13 @@ Page content:
             print("    Using BeautifulSoup parser (set ANTHROPIC_API_KEY for better results)")
             return self.parse_with_beautifulsoup(html, draft_year, url)
 
-    def scrape(self, url, draft_year):
-        """Scrape a single URL and store results."""
+    def scrape(self, url, draft_year, scrape_log=None):
+        """Scrape a single URL and store results.
+
+        Pass a db.models.ScrapeLogger as scrape_log to batch the scrape_log
+        entry with the rest of the run instead of writing it immediately.
+        """
+        log = scrape_log.log if scrape_log else log_scrape
         print(f"  Scraping {self.SOURCE_NAME} ({self.SPORT}) for {draft_year}: {url}")
 
         try:
@@ -226,6 +231,7 @@ Page content:
 
             players_data = self.parse(html, draft_year, url)
             today = date.today().isoformat()
+            rankings = []
 
             for p in players_data:
                 player_id = upsert_player(
@@ -235,24 +241,27 @@ Page content:
                     school=p.get("school"),
                     position=p.get("position"),
                 )
-                add_ranking(
-                    player_id=player_id,
-                    source=self.SOURCE_NAME,
-                    rank=p.get("rank"),
-                    projected_pick=p.get("projected_pick"),
-                    projected_round=p.get("projected_round"),
-                    url=url,
-                    raw_text=p.get("notes"),
-                    scrape_date=today,
-                )
-
-            log_scrape(self.SOURCE_NAME, url, draft_year, "success",
-                       players_found=len(players_data))
+                rankings.append({
+                    "player_id": player_id,
+                    "source": self.SOURCE_NAME,
+                    "rank": p.get("rank"),
+                    "projected_pick": p.get("projected_pick"),
+                    "projected_round": p.get("projected_round"),
+                    "url": url,
+                    "raw_text": p.get("notes"),
+                    "scrape_date": today,
+                })
+
+            # All of this page's rankings in one transaction
+            add_rankings_bulk(rankings)
+
+            log(self.SOURCE_NAME, url, draft_year, "success",
+                players_found=len(players_data))
             print(f"    Found {len(players_data)} players")
             return players_data
 
         except Exception as e:
-            log_scrape(self.SOURCE_NAME, url, draft_year, "error",
-                       error_message=str(e))
+            log(self.SOURCE_NAME, url, draft_year, "error",
+                error_message=str(e))
             print(f"    ERROR: {e}")
             return []
@@ -363,7 +363,6 @@ def hunt_remaining_photos():
     """
 
     players = conn.execute(query).fetchall()
-    conn.close()
 
     print(f"Deep hunting photos for {len(players)} players...")
 
@@ -153,7 +153,6 @@ def scrape_player_stats(player_name, school=None):
             "SELECT id, name, school, draft_year FROM players WHERE name LIKE ?",
             (f"%{player_name}%",),
         ).fetchone()
-    conn.close()
 
     if not row:
         print(f"Player '{player_name}' not found in database.")
@@ -236,7 +235,6 @@ def scrape_all_stats():
     players = conn.execute(
         "SELECT DISTINCT id, name, school, draft_year FROM players WHERE school IS NOT NULL ORDER BY draft_year, name"
     ).fetchall()
-    conn.close()
 
     print(f"Checking stats for {len(players)} players...")
     scraped_schools = set()
@@ -270,7 +268,6 @@ def detect_hot_cold():
         JOIN player_stats ps ON p.id = ps.player_id
         ORDER BY p.draft_year, p.name
     """).fetchall()
-    conn.close()
 
     if not players:
         print("No player stats available for detection.")
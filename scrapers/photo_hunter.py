@@ -263,7 +263,6 @@ def hunt_all_photos(limit=None):
     """
 
     players = conn.execute(query).fetchall()
-    conn.close()
 
     if limit:
         players = players[:limit]
@@ -377,7 +377,6 @@ def scrape_all_photos(draft_year=None, sport=None):
     query += " ORDER BY sport, draft_year, name"
 
     players = conn.execute(query, params).fetchall()
-    conn.close()
 
     print(f"Found {len(players)} players without photos")
 
@@ -424,7 +423,6 @@ def scrape_player_photo_by_name(player_name):
         "SELECT id, name, school FROM players WHERE name LIKE ? LIMIT 1",
         (f"%{player_name}%",)
     ).fetchone()
-    conn.close()
 
     if not player:
         print(f"Player not found: {player_name}")